@@ -2,14 +2,19 @@
 Conflux Community Member Tracking Dashboard
 """
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import pytz
 
 from src.data.database import MemberDatabase
-from src.data.scraper import MemberScraper
+from src.data.registry import get_registry
+from src.data.series_store import SeriesStore
+from src.data.snapshot import DEFAULT_SNAPSHOT_PATH, DashboardSnapshot, write_snapshot
+from src.data.analytics import compare_runs, overview_metrics, summary_text, window_deltas
+from src.utils.downsample import downsample, point_budget
+from src.components.group_grid import render_group_grid
+from src.data.async_scraper import scrape_all
 
 # Page configuration
 st.set_page_config(
@@ -19,25 +24,6 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Country-themed color palette
-COUNTRY_COLORS = {
-    "Africa (TG)": "#E8B923",  # Gold (pan-African colors)
-    "Arabic (TG)": "#00843D",  # Green (Arab League)
-    "China Official (TG)": "#DE2910",  # Red (China flag)
-    "China Web3 Community (TG)": "#FFDE00",  # Yellow (China flag stars)
-    "English (Discord)": "#5865F2",  # Discord blurple
-    "English (TG)": "#012169",  # Blue (UK flag)
-    "French (TG)": "#0055A4",  # Blue (France flag)
-    "Indonesia (TG)": "#FF0000",  # Red (Indonesia flag)
-    "Korea (TG)": "#003478",  # Blue (South Korea flag)
-    "LATAM (TG)": "#FCD116",  # Yellow (Colombia - represents LATAM)
-    "Persia (TG)": "#239F40",  # Green (Iran flag)
-    "Russian (TG)": "#0039A6",  # Blue (Russia flag)
-    "Turkey (TG)": "#E30A17",  # Red (Turkey flag)
-    "Ukraine (TG)": "#0057B7",  # Blue (Ukraine flag)
-    "Vietnam (TG)": "#DA251D",  # Red (Vietnam flag)
-}
-
 # Custom CSS for Google Analytics style dark theme
 st.markdown("""
 <style>
@@ -216,10 +202,26 @@ st.markdown("""
 @st.cache_resource
 def get_database():
     """Get database connection (cached)"""
-    return MemberDatabase()
+    # WAL so viewers keep reading while a collection writes
+    return MemberDatabase(profile="wal")
 
 db = get_database()
 
+# Group colours and regions come from data/groups.json
+@st.cache_resource
+def get_group_registry():
+    """Get the group registry (loaded once per process)"""
+    return get_registry()
+
+registry = get_group_registry()
+
+# Per-group daily series for the charts, shared by every session; read from the
+# day rollups (one row per group and day) and rebuilt when the data changes
+@st.cache_resource(max_entries=1)
+def get_series_store(data_version):
+    """Get the in-memory series store for a data version"""
+    return SeriesStore.from_frame(db.get_all_data(resolution='day'))
+
 # Initialize session state for dialog
 if 'show_collect_dialog' not in st.session_state:
     st.session_state.show_collect_dialog = False
@@ -250,11 +252,10 @@ with col1:
 with col2:
     # Collect button in header
     if st.button("🔄 Collect Data", use_container_width=True, type="primary"):
-        # Get latest timestamp to show days since last refresh
-        temp_data = db.get_all_data()
-        if not temp_data.empty:
-            temp_data['timestamp'] = pd.to_datetime(temp_data['timestamp'])
-            last_refresh = temp_data['timestamp'].max()
+        # Get latest run to show days since last refresh
+        latest_runs = db.get_runs()
+        if not latest_runs.empty:
+            last_refresh = latest_runs['started_at'].iloc[0]
             days_since = (datetime.now() - last_refresh).days
             st.session_state.days_since_refresh = days_since
             st.session_state.show_collect_dialog = True
@@ -270,68 +271,113 @@ if st.session_state.show_collect_dialog:
 if st.session_state.confirm_collect:
     st.session_state.confirm_collect = False
     with st.spinner("Scraping..."):
-        scraper = MemberScraper()
-        counts = scraper.scrape_all()
+        counts = scrape_all()
         successful = {k: v for k, v in counts.items() if v is not None}
         failed = [k for k, v in counts.items() if v is None]
 
         if successful:
-            db.add_member_counts(successful)
-            st.success(f"✅ {len(successful)}/15 groups")
+            # Failed groups are passed too so the run is recorded as partial
+            db.add_member_counts(counts)
+            write_snapshot(db)
+            st.success(f"✅ {len(successful)}/{len(registry)} groups")
         if failed:
             st.warning(f"⚠️ Failed: {', '.join(failed)}")
         st.rerun()
 
-# Get data
-all_data = db.get_all_data()
+# Precomputed views written by the last collection (memory-mapped, reloaded when the
+# file changes; only the current version is kept open)
+@st.cache_resource(max_entries=1)
+def get_dashboard_snapshot(modified):
+    """Open the dashboard snapshot file (once per file version)"""
+    return DashboardSnapshot.load(DEFAULT_SNAPSHOT_PATH)
+
+snapshot = get_dashboard_snapshot(DEFAULT_SNAPSHOT_PATH.stat().st_mtime if DEFAULT_SNAPSHOT_PATH.exists() else None)
+
+# Derived views and figures are memoized per data version: it is read from the
+# database file, so it changes when any process commits a collection, and widget
+# clicks in between are cache hits
+file_version = db.data_version()
+latest_run_id = db.get_latest_run_id()
+data_version = (latest_run_id, file_version)
+
+# Get data: from the snapshot while it is current, otherwise straight from the database
+if snapshot is not None and snapshot.latest_run_id == latest_run_id:
+    source = snapshot
+else:
+    source = db
+
+
+@st.cache_data(max_entries=8)
+def load_daily_runs(data_version, _source):
+    """Latest run of each day, newest first"""
+    return _source.runs if isinstance(_source, DashboardSnapshot) else _source.get_daily_runs()
+
+
+@st.cache_data(max_entries=8)
+def load_overview(data_version, latest_run, previous_run, _source):
+    """Headline metrics of the latest run against the previous day's"""
+    if isinstance(_source, DashboardSnapshot) and _source.overview is not None:
+        return _source.overview
+    snapshots = _source.get_snapshots([run for run in (latest_run, previous_run) if run is not None])
+    return overview_metrics(snapshots, latest_run, previous_run)
+
+
+@st.cache_data(max_entries=64)
+def load_comparison(data_version, from_run, to_run, _source):
+    """Group and region deltas between two runs, and the summary text"""
+    if isinstance(_source, DashboardSnapshot):
+        if _source.comparison_runs == (from_run, to_run):
+            return _source.comparison
+        if not _source.holds({from_run, to_run}):
+            # The snapshot only keeps the latest two days' counts
+            _source = db
+    snapshots = _source.get_snapshots(sorted({from_run, to_run}))
+    group_deltas, region_deltas = compare_runs(snapshots, from_run, to_run, registry)
+    return group_deltas, region_deltas, summary_text(group_deltas)
+
 
-if all_data.empty:
+@st.cache_data(max_entries=32)
+def load_window_growth(data_version, start, end):
+    """First-to-last change of every group within a time window"""
+    return window_deltas(get_series_store(data_version), start, end)
+
+
+latest_per_day = load_daily_runs(data_version, source)
+
+if latest_per_day.empty:
     st.info("👋 No data yet! Click **'Collect Data'** to get started.")
     st.stop()
 
-all_data['timestamp'] = pd.to_datetime(all_data['timestamp'])
-
-# Get latest collection per day (only show one per day)
-all_data['date_only'] = all_data['timestamp'].dt.date
-latest_per_day = all_data.groupby('date_only')['timestamp'].max()
-collection_times = sorted([pd.Timestamp(t) for t in latest_per_day.values], reverse=True)
+# Get latest collection per day (only show one per day); runs come newest first
+collection_times = list(latest_per_day['started_at'])
+run_ids = dict(zip(latest_per_day['started_at'], latest_per_day['id'].tolist()))
 
 # === Overview Metrics (Google Analytics style) ===
 st.markdown('<div class="section-container">', unsafe_allow_html=True)
 st.subheader("📊 Overview")
 
-# Calculate key metrics
-latest_data = all_data[all_data['timestamp'] == collection_times[0]]
-latest_total = latest_data['member_count'].sum()
-
-if len(collection_times) >= 2:
-    previous_data = all_data[all_data['timestamp'] == collection_times[1]]
-    previous_total = previous_data['member_count'].sum()
-    growth = latest_total - previous_total
-    growth_pct = (growth / previous_total * 100) if previous_total > 0 else 0
-else:
-    growth = 0
-    growth_pct = 0
+# Calculate key metrics from the latest two runs only
+previous_run = run_ids[collection_times[1]] if len(collection_times) >= 2 else None
+overview = load_overview(data_version, run_ids[collection_times[0]], previous_run, source)
 
 # Top row metrics
 metric_cols = st.columns(4)
 
 with metric_cols[0]:
-    st.metric("TOTAL MEMBERS", f"{latest_total:,}", f"{growth:+,} ({growth_pct:+.1f}%)")
+    st.metric("TOTAL MEMBERS", f"{overview.total:,}", f"{overview.growth:+,} ({overview.growth_pct:+.1f}%)")
 
 with metric_cols[1]:
-    st.metric("TOTAL GROUPS", f"{len(latest_data)}")
+    st.metric("TOTAL GROUPS", f"{overview.group_count}")
 
 with metric_cols[2]:
-    avg_per_group = latest_total / len(latest_data) if len(latest_data) > 0 else 0
+    avg_per_group = overview.total / overview.group_count if overview.group_count > 0 else 0
     st.metric("AVG PER GROUP", f"{avg_per_group:,.0f}")
 
 with metric_cols[3]:
-    largest_group = latest_data.nlargest(1, 'member_count')
-    if not largest_group.empty:
+    if overview.largest_group is not None:
         st.metric("LARGEST GROUP",
-                  f"{largest_group.iloc[0]['member_count']:,}",
-                  largest_group.iloc[0]['group_name'].split(' (')[0][:15])
+                  f"{overview.largest_count:,}",
+                  overview.largest_group.split(' (')[0][:15])
 
 st.markdown('</div>', unsafe_allow_html=True)
 
@@ -360,40 +406,10 @@ with col_to:
         format_func=lambda x: x.strftime("%b %d, %Y %I:%M %p")
     )
 
-# Get counts for selected dates
-from_data = all_data[all_data['timestamp'] == from_date]
-to_data = all_data[all_data['timestamp'] == to_date]
-
-# Build dictionaries for comparison
-from_counts = dict(zip(from_data['group_name'], from_data['member_count']))
-to_counts = dict(zip(to_data['group_name'], to_data['member_count']))
-
-# Regional breakdown
-regions = {
-    "Africa": ["Africa (TG)"],
-    "Asia": ["Indonesia (TG)", "Korea (TG)", "Vietnam (TG)"],
-    "China": ["China Official (TG)", "China Web3 Community (TG)"],
-    "EU + Russian + Ukraine": ["French (TG)", "Russian (TG)", "Ukraine (TG)"],
-    "Global (English)": ["English (TG)", "English (Discord)"],
-    "Middle East": ["Arabic (TG)", "Persia (TG)", "Turkey (TG)"],
-    "Spanish (LATAM)": ["LATAM (TG)"]
-}
-
-# Calculate regional totals
-regional_data = []
-for region, groups in regions.items():
-    current_total = sum(to_counts.get(g, 0) for g in groups)
-    previous_total = sum(from_counts.get(g, 0) for g in groups)
-    delta = current_total - previous_total
-    regional_data.append({
-        "region": region,
-        "current": current_total,
-        "delta": delta,
-        "groups": groups
-    })
-
-# Sort by current count
-regional_data.sort(key=lambda x: x['current'], reverse=True)
+# Fetch exactly the two selected runs and compute group and regional deltas in one
+# vectorized pass (regions come sorted by current count)
+group_deltas, region_deltas, summary_text = load_comparison(data_version, run_ids[from_date], run_ids[to_date], source)
+regions = registry.regions
 
 # Copy-pastable summary text
 col_title, col_button = st.columns([3, 1])
@@ -402,18 +418,6 @@ with col_title:
 with col_button:
     st.write("")  # Spacing
 
-summary_items = []
-all_groups = sorted(to_counts.keys())
-
-for group_name in all_groups:
-    current_count = to_counts[group_name]
-    prev_count = from_counts.get(group_name, current_count)
-    delta = current_count - prev_count
-    delta_str = f"({delta:+d})" if delta != 0 else "(0)"
-    summary_items.append(f"{group_name}: {current_count} {delta_str}")
-
-summary_text = "\n".join(summary_items)
-
 # Text area and copy button
 col_text, col_copy = st.columns([4, 1])
 with col_text:
@@ -439,18 +443,20 @@ st.subheader("🌍 Regional Distribution")
 
 # Regional cards in 3 columns - redesigned with header + grid
 region_cols = st.columns(3)
-for idx, region_info in enumerate(regional_data):
+for idx, (region, region_current, region_delta) in enumerate(zip(
+        region_deltas.regions.tolist(), region_deltas.current.tolist(), region_deltas.delta.tolist())):
+    region_groups = regions[region]
     with region_cols[idx % 3]:
         # Outer container
         st.markdown('<div class="regional-container">', unsafe_allow_html=True)
 
         # Main regional header (dark section at top)
         st.markdown('<div class="regional-main-header">', unsafe_allow_html=True)
-        delta_color = "normal" if region_info['delta'] >= 0 else "inverse"
+        delta_color = "normal" if region_delta >= 0 else "inverse"
         st.metric(
-            region_info['region'],
-            f"{region_info['current']:,}",
-            f"{region_info['delta']:+,}",
+            region,
+            f"{region_current:,}",
+            f"{region_delta:+,}",
             delta_color=delta_color
         )
         st.markdown('</div>', unsafe_allow_html=True)
@@ -459,16 +465,14 @@ for idx, region_info in enumerate(regional_data):
         st.markdown('<div class="regional-subs-grid">', unsafe_allow_html=True)
 
         # Create sub-columns for grid layout
-        if len(region_info['groups']) > 1:
+        if len(region_groups) > 1:
             sub_cols = st.columns(2)
         else:
             sub_cols = [st.container()]
 
-        for sub_idx, group_name in enumerate(region_info['groups']):
-            if group_name in to_counts:
-                current_count = to_counts[group_name]
-                prev_count = from_counts.get(group_name, current_count)
-                delta = current_count - prev_count
+        for sub_idx, group_name in enumerate(region_groups):
+            if group_name in group_deltas:
+                current_count, delta = group_deltas.get(group_name)
                 delta_color_group = "normal" if delta >= 0 else "inverse"
 
                 # Keep (TG) and (Discord) labels
@@ -494,67 +498,89 @@ st.markdown('</div>', unsafe_allow_html=True)
 st.markdown('<div class="section-container">', unsafe_allow_html=True)
 st.subheader("📈 Total Growth")
 
-aggregated_data = db.get_aggregated_totals()
+# Approximate rendered width in the wide layout; it sets the downsampling point budget
+GROWTH_CHART_WIDTH_PX = 1400
 
-if not aggregated_data.empty:
-    # Time range filter (more compact)
-    time_range = st.radio(
-        "Time Range",
-        ["All Time", "2 Weeks", "Month", "Quarter", "6 Months", "Year", "Custom"],
-        horizontal=True,
-        index=0,
-        label_visibility="collapsed"
-    )
+# Individual Groups cards per page (4 rows of 3)
+GROUPS_PER_PAGE = 12
 
-    # Filter data
-    filtered_data = aggregated_data.copy()
-    now = datetime.now()
+time_map = {
+    "2 Weeks": 14,
+    "Month": 30,
+    "Quarter": 90,
+    "6 Months": 180,
+    "Year": 365
+}
 
-    time_map = {
-        "2 Weeks": 14,
-        "Month": 30,
-        "Quarter": 90,
-        "6 Months": 180,
-        "Year": 365
-    }
 
+def time_window(time_range, custom_from=None, custom_to=None):
+    """(start, end) bounds for a Time Range choice; None means unbounded"""
     if time_range == "Custom":
-        # Show custom date range selectors
-        col_from_growth, col_to_growth = st.columns(2)
-
-        with col_from_growth:
-            from_options_growth = collection_times[1:] if len(collection_times) >= 2 else collection_times
-            from_date_growth = st.selectbox(
-                "From:",
-                from_options_growth,
-                index=0,
-                format_func=lambda x: x.strftime("%b %d, %Y %I:%M %p"),
-                key="growth_from_date"
-            )
-
-        with col_to_growth:
-            to_date_growth = st.selectbox(
-                "To:",
-                collection_times,
-                index=0,
-                format_func=lambda x: x.strftime("%b %d, %Y %I:%M %p"),
-                key="growth_to_date"
-            )
-
-        # Filter by custom date range
-        filtered_data = filtered_data[(filtered_data['timestamp'] >= from_date_growth) &
-                                       (filtered_data['timestamp'] <= to_date_growth)]
-    elif time_range in time_map:
-        cutoff = now - timedelta(days=time_map[time_range])
-        filtered_data = filtered_data[filtered_data['timestamp'] >= cutoff]
+        return custom_from.to_pydatetime(), custom_to.to_pydatetime()
+    if time_range in time_map:
+        # Whole days, so reruns ask for the same window and hit the query cache
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return today - timedelta(days=time_map[time_range]), None
+    return None, None
+
+
+# Time range filter (more compact)
+time_range = st.radio(
+    "Time Range",
+    ["All Time", "2 Weeks", "Month", "Quarter", "6 Months", "Year", "Custom"],
+    horizontal=True,
+    index=0,
+    label_visibility="collapsed"
+)
+
+from_date_growth = to_date_growth = None
+if time_range == "Custom":
+    # Show custom date range selectors
+    col_from_growth, col_to_growth = st.columns(2)
+
+    with col_from_growth:
+        from_options_growth = collection_times[1:] if len(collection_times) >= 2 else collection_times
+        from_date_growth = st.selectbox(
+            "From:",
+            from_options_growth,
+            index=0,
+            format_func=lambda x: x.strftime("%b %d, %Y %I:%M %p"),
+            key="growth_from_date"
+        )
+
+    with col_to_growth:
+        to_date_growth = st.selectbox(
+            "To:",
+            collection_times,
+            index=0,
+            format_func=lambda x: x.strftime("%b %d, %Y %I:%M %p"),
+            key="growth_to_date"
+        )
+
+@st.cache_data(max_entries=32)
+def growth_figure(data_version, start, end, _source):
+    """Total Growth figure (as a Plotly dict) for a time window, or None if the window is empty"""
+    if isinstance(_source, DashboardSnapshot) and start is None and end is None:
+        # All Time is precomputed in the snapshot
+        filtered_data = _source.totals
+    else:
+        # Only the window is read, from a day/week/month rollup when it is long enough
+        filtered_data = db.get_aggregated_totals(start, end, resolution='auto')
+    if filtered_data.empty:
+        return None
+
+    # Keep the payload bounded by the chart's width, not by how much history there is
+    growth_x, growth_y = downsample(filtered_data['timestamp'], filtered_data['total_members'],
+                                    point_budget(GROWTH_CHART_WIDTH_PX))
+    downsampled = len(growth_x) < len(filtered_data)
 
     # Modern chart with gradient
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
-        x=filtered_data['timestamp'],
-        y=filtered_data['total_members'],
-        mode='lines+markers',
+        x=growth_x,
+        y=growth_y,
+        mode='lines' if downsampled else 'lines+markers',
         name='Total Members',
         line=dict(color='#5865F2', width=3),
         marker=dict(size=8, color='#5865F2'),
@@ -583,7 +609,12 @@ if not aggregated_data.empty:
         font=dict(color='#e8eaed')
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig.to_dict()
+
+
+growth_fig = growth_figure(data_version, *time_window(time_range, from_date_growth, to_date_growth), source)
+if growth_fig is not None:
+    st.plotly_chart(growth_fig, use_container_width=True)
 
 st.markdown('</div>', unsafe_allow_html=True)
 
@@ -625,79 +656,21 @@ if time_range_ind == "Custom":
         )
 
 # Use all groups from latest counts (correct nomenclature)
-selected_groups = sorted(to_counts.keys())
+selected_groups = group_deltas.groups.tolist()
 
 if selected_groups:
-    # Filter by time
-    filtered_all_data = all_data.copy()
-
+    # Each group's series is a slice of the shared store, so no per-group scans
     if time_range_ind == "Custom":
-        # Filter by custom date range
-        filtered_all_data = filtered_all_data[(filtered_all_data['timestamp'] >= from_date_ind) &
-                                               (filtered_all_data['timestamp'] <= to_date_ind)]
-    elif time_range_ind in time_map:
-        cutoff = now - timedelta(days=time_map[time_range_ind])
-        filtered_all_data = filtered_all_data[filtered_all_data['timestamp'] >= cutoff]
-
-    # Create compact grid (3 columns)
-    cols_per_row = 3
-
-    for i in range(0, len(selected_groups), cols_per_row):
-        cols = st.columns(cols_per_row)
-
-        for j, col in enumerate(cols):
-            group_idx = i + j
-            if group_idx >= len(selected_groups):
-                break
-
-            group_name = selected_groups[group_idx]
-            group_data = filtered_all_data[filtered_all_data['group_name'] == group_name]
-
-            if not group_data.empty:
-                with col:
-                    # Get color for this country
-                    color = COUNTRY_COLORS.get(group_name, '#999999')
-
-                    # Compact metric
-                    if len(group_data) > 1:
-                        growth = group_data['member_count'].iloc[-1] - group_data['member_count'].iloc[0]
-                        st.metric(
-                            group_name,
-                            f"{group_data['member_count'].iloc[-1]:,.0f}",
-                            f"{growth:+,}"
-                        )
-                    else:
-                        st.metric(
-                            group_name,
-                            f"{group_data['member_count'].iloc[-1]:,.0f}"
-                        )
-
-                    # Compact modern chart
-                    fig = go.Figure()
-
-                    fig.add_trace(go.Scatter(
-                        x=group_data['timestamp'],
-                        y=group_data['member_count'],
-                        mode='lines+markers',
-                        line=dict(color=color, width=2),
-                        marker=dict(size=5, color=color),
-                        fill='tozeroy',
-                        fillcolor=f'rgba({int(color[1:3], 16)}, {int(color[3:5], 16)}, {int(color[5:7], 16)}, 0.1)',
-                        hovertemplate='%{y:,}<extra></extra>'
-                    ))
-
-                    fig.update_layout(
-                        height=150,
-                        margin=dict(l=0, r=0, t=0, b=0),
-                        showlegend=False,
-                        plot_bgcolor='#2d2d2d',
-                        paper_bgcolor='#2d2d2d',
-                        xaxis=dict(showticklabels=False, showgrid=False, color='#9aa0a6'),
-                        yaxis=dict(showticklabels=False, showgrid=False, color='#9aa0a6'),
-                        font=dict(color='#e8eaed')
-                    )
-
-                    st.plotly_chart(fig, use_container_width=True, key=f"chart_{group_name}")
+        start, end = time_window(time_range_ind, from_date_ind, to_date_ind)
+    else:
+        start, end = time_window(time_range_ind)
+    # Daily series from the rollups, so the raw history is never loaded
+    series_store = get_series_store(data_version)
+    window_growth = load_window_growth(data_version, start, end)
+
+    # Only the current page of groups gets figures built
+    render_group_grid(selected_groups, series_store, window_growth, registry, start, end,
+                      page_size=GROUPS_PER_PAGE, key="individual", data_version=data_version)
 
 st.markdown('</div>', unsafe_allow_html=True)
 
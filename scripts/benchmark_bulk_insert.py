@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ingesting historical rows with add_member_counts vs add_member_counts_bulk
+
+add_member_counts also refreshes the run, totals and rollup tables for each
+collection, so the bulk path is compared with a plain ORM insert of the same
+rows as well: that difference is executemany alone.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.database import MemberCount, MemberDatabase
+from src.data.registry import get_registry
+
+
+def generate_rows(total_rows, groups):
+    """Yield (timestamp, group_name, member_count) rows, one collection per hour"""
+    start = datetime(2020, 1, 1)
+    runs = total_rows // len(groups)
+    for run in range(runs):
+        timestamp = start + timedelta(hours=run)
+        for idx, group in enumerate(groups):
+            yield timestamp, group, 1000 + idx * 100 + run % 500
+
+
+def collections(rows):
+    """Group rows into (timestamp, {group_name: count}) per collection"""
+    batch = {}
+    current = None
+    for timestamp, group, count in rows:
+        if timestamp != current and batch:
+            yield current, batch
+            batch = {}
+        current = timestamp
+        batch[group] = count
+    if batch:
+        yield current, batch
+
+
+def bench_plain_orm(db, rows):
+    """Baseline: one ORM transaction per collection adding MemberCount objects, nothing else"""
+    start = time.perf_counter()
+    for timestamp, batch in collections(rows):
+        with db.session_scope() as session:
+            group_ids = db._group_ids(session.connection(), batch)
+            session.add_all(
+                MemberCount(timestamp=timestamp, group_id=group_ids[group], member_count=count)
+                for group, count in batch.items()
+            )
+    return time.perf_counter() - start
+
+
+def bench_orm(db, rows):
+    """Collection path: one add_member_counts call (ORM objects plus summary refresh) per collection"""
+    start = time.perf_counter()
+    for timestamp, batch in collections(rows):
+        db.add_member_counts(batch, timestamp)
+    return time.perf_counter() - start
+
+
+def bench_bulk(db, rows):
+    """New path: Core executemany in chunks"""
+    start = time.perf_counter()
+    db.add_member_counts_bulk(rows)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000, help="rows for the bulk path")
+    parser.add_argument('--orm-rows', type=int, default=50_000,
+                        help="rows for the ORM paths (extrapolated; they are too slow for the full set)")
+    args = parser.parse_args()
+
+    groups = get_registry().names
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_db = MemberDatabase(str(Path(tmp) / 'plain.db'))
+        plain_seconds = bench_plain_orm(plain_db, generate_rows(args.orm_rows, groups))
+        plain_db.close()
+
+        orm_db = MemberDatabase(str(Path(tmp) / 'orm.db'))
+        orm_seconds = bench_orm(orm_db, generate_rows(args.orm_rows, groups))
+        orm_db.close()
+
+        bulk_db = MemberDatabase(str(Path(tmp) / 'bulk.db'))
+        bulk_seconds = bench_bulk(bulk_db, generate_rows(args.rows, groups))
+        stored = len(bulk_db.get_all_data())
+        bulk_db.close()
+
+    plain_rate = args.orm_rows / plain_seconds
+    orm_rate = args.orm_rows / orm_seconds
+    bulk_rate = stored / bulk_seconds
+
+    print(f"Plain ORM insert:        {args.orm_rows:>9,} rows in {plain_seconds:7.2f}s "
+          f"({plain_rate:,.0f} rows/s, ~{args.rows / plain_rate:,.0f}s for {args.rows:,})")
+    print(f"ORM add_member_counts:   {args.orm_rows:>9,} rows in {orm_seconds:7.2f}s "
+          f"({orm_rate:,.0f} rows/s, ~{args.rows / orm_rate:,.0f}s for {args.rows:,})")
+    print(f"add_member_counts_bulk:  {stored:>9,} rows in {bulk_seconds:7.2f}s ({bulk_rate:,.0f} rows/s)")
+    # The bulk path refreshes the summaries too, so the first figure understates executemany alone
+    print(f"Speedup vs plain ORM insert:    {bulk_rate / plain_rate:.1f}x")
+    print(f"Speedup vs add_member_counts:   {bulk_rate / orm_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: member-count parsing, legacy regex chain vs parse_member_count
+"""
+import re
+import sys
+import timeit
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bs4 import BeautifulSoup
+
+from src.data.parsing import parse_member_count
+from src.data.scraper import MemberScraper
+
+SAMPLE_TEXTS = [
+    "Conflux English\n14 760 members, 1 234 online\nView in Telegram",
+    "Conflux News\n1,234 subscribers\nPreview channel",
+    "Conflux Korea\n1.2K members\nJoin group",
+    "Conflux Global\n1.5M subscribers\nPreview channel",
+]
+
+# A page shaped like t.me: lots of markup, count near the end
+SAMPLE_PAGE = (
+    '<html><head><meta property="og:title" content="Conflux English"></head><body>'
+    + '<div class="tgme_page_widget"><span>filler</span></div>' * 300
+    + '<div class="tgme_page_extra">14 760 members, 1 234 online</div>'
+    + '</body></html>'
+).encode('utf-8')
+
+
+def legacy_parse_member_count(text):
+    """The four-pattern code path scrape_telegram_group used before parse_member_count"""
+    patterns = [
+        r'([\d\s,]+)\s+members',
+        r'([\d\s,]+)\s+subscribers',
+        r'([\d.]+[KM])\s+members',
+        r'([\d.]+[KM])\s+subscribers',
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            count_str = match.group(1).strip()
+            if 'K' in count_str.upper():
+                return int(float(count_str.replace('K', '').replace(',', '').replace(' ', '')) * 1000)
+            elif 'M' in count_str.upper():
+                return int(float(count_str.replace('M', '').replace(',', '').replace(' ', '')) * 1000000)
+            else:
+                return int(count_str.replace(',', '').replace(' ', ''))
+
+    return None
+
+
+def legacy_parse_page(page):
+    """Full-document BeautifulSoup parse followed by the legacy regex chain"""
+    return legacy_parse_member_count(BeautifulSoup(page, 'html.parser').get_text())
+
+
+def bench(label, func, arg, number):
+    """Time func(arg) and print microseconds per call"""
+    seconds = timeit.timeit(lambda: func(arg), number=number)
+    per_call = seconds / number * 1e6
+    print(f"  {label:<28} {per_call:10.2f} us/call")
+    return per_call
+
+
+def main():
+    """Run the benchmark"""
+    print("Count pattern matching (text already extracted):")
+    for text in SAMPLE_TEXTS:
+        assert legacy_parse_member_count(text) == parse_member_count(text), text
+        print(f"- {text.splitlines()[1]!r}")
+        old = bench("legacy (4x re.search)", legacy_parse_member_count, text, 20000)
+        new = bench("parse_member_count", parse_member_count, text, 20000)
+        print(f"  speedup: {old / new:.1f}x")
+
+    print("\nWhole Telegram page:")
+    assert legacy_parse_page(SAMPLE_PAGE) == MemberScraper.parse_telegram_page(SAMPLE_PAGE)
+    old = bench("legacy (BeautifulSoup)", legacy_parse_page, SAMPLE_PAGE, 50)
+    new = bench("parse_telegram_page", MemberScraper.parse_telegram_page, SAMPLE_PAGE, 5000)
+    print(f"  speedup: {old / new:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,39 +8,45 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.data.scraper import MemberScraper
+from src.data.async_scraper import scrape_all_outcomes
 from src.data.database import MemberDatabase
+from src.data.snapshot import write_snapshot
 
 
 def main():
     """Run data collection"""
     print("Starting data collection...")
 
-    # Initialize scraper with Selenium for GitHub Actions
-    scraper = MemberScraper(use_selenium=True)
-
-    # Scrape all groups
+    # Scrape all groups on one event loop, with Selenium fallback for GitHub Actions
     print("Scraping Telegram groups and Discord...")
-    counts = scraper.scrape_all()
+    outcomes = scrape_all_outcomes(use_selenium=True)
 
     # Filter successful scrapes
-    successful = {k: v for k, v in counts.items() if v is not None}
-    failed = [k for k, v in counts.items() if v is None]
+    successful = {name: o.count for name, o in outcomes.items() if o.ok}
+    failed = [o for o in outcomes.values() if not o.ok]
 
     # Save to database
     if successful:
-        db = MemberDatabase()
-        db.add_member_counts(successful)
+        db = MemberDatabase(profile="wal")
+        # Failed groups are passed too so the run is recorded as partial
+        db.add_member_counts({name: o.count for name, o in outcomes.items()})
+
+        # Precomputed views for the dashboard's cold start
+        snapshot_path = write_snapshot(db)
         db.close()
+        print(f"Wrote dashboard snapshot to {snapshot_path}")
 
         print(f"\n✅ Successfully collected data for {len(successful)} groups:")
         for name, count in successful.items():
-            print(f"  - {name}: {count:,} members")
+            outcome = outcomes[name]
+            retries = f", {outcome.attempts} attempts" if outcome.attempts > 1 else ""
+            print(f"  - {name}: {count:,} members ({outcome.latency:.1f}s{retries})")
 
     if failed:
         print(f"\n⚠️  Failed to scrape {len(failed)} groups:")
-        for name in failed:
-            print(f"  - {name}")
+        for outcome in failed:
+            print(f"  - {outcome.name}: {outcome.error} "
+                  f"({outcome.attempts} attempts, {outcome.latency:.1f}s)")
 
     # Exit with error if all scrapes failed
     if not successful:
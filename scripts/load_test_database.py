@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Load test: concurrent dashboard reruns against one shared MemberDatabase
+
+Two comparisons, both with the query cache off so every page load reads SQLite:
+
+1. Session model: page loads from N threads serialized behind one lock (what
+   a single shared Session allows) vs pooled per-call sessions. A page load
+   is mostly SQLAlchemy row processing and the DataFrame build, which hold
+   the GIL, so pooling only pays off once there are cores to spare (or reads
+   wait on disk); with one CPU the two come out level.
+2. Readers during collections: the latest-run reads of a page load for a
+   fixed time while another process commits one collection (add_member_counts,
+   as scripts/collect_data.py does) at a fixed pace, with the 'default'
+   profile (rollback journal, fsync per commit, readers locked out while the
+   writer commits) vs the 'wal' profile. The pace is the same for both so
+   the readers get the same share of the CPU; what differs is how long each
+   commit takes and how often readers wait on it.
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.database import MemberDatabase
+from src.data.registry import get_registry
+
+START = datetime(2024, 1, 1)
+
+
+def populate(db, runs, groups):
+    """Fill the database with one collection per hour"""
+    db.add_member_counts_bulk(
+        (START + timedelta(hours=run), group, 1000 + idx * 100 + run % 500)
+        for run in range(runs)
+        for idx, group in enumerate(groups)
+    )
+
+
+def dashboard_rerun(db):
+    """The reads one dashboard page load makes"""
+    latest = db.get_latest_counts()
+    if latest:
+        latest_time = next(iter(latest.values()))[1]
+        db.get_previous_counts(latest_time)
+    db.get_all_data()
+    db.get_aggregated_totals()
+
+
+def latest_view(db):
+    """The reads a page load still makes once history comes from the snapshot"""
+    latest = db.get_latest_counts()
+    if latest:
+        latest_time = next(iter(latest.values()))[1]
+        db.get_previous_counts(latest_time)
+        db.get_aggregated_totals(latest_time - timedelta(days=30))
+
+
+def run(db, threads, reruns, lock=None, page=dashboard_rerun):
+    """
+    Run reruns page loads spread over threads workers
+
+    Args:
+        db: Shared database
+        threads: Concurrent viewers
+        reruns: Total page loads
+        lock: If given, every page load holds it (one shared session's worth of concurrency)
+        page: The reads one page load makes
+
+    Returns:
+        (seconds, errors, per-load latencies in seconds)
+    """
+    errors = []
+    latencies = []
+    guard = lock if lock is not None else nullcontext()
+
+    def one(_):
+        start = time.perf_counter()
+        try:
+            with guard:
+                page(db)
+        except Exception as e:
+            errors.append(e)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(one, range(reruns)))
+    return time.perf_counter() - start, errors, latencies
+
+
+def write_collections(db_path, profile, groups, first_run, interval, ready, stop, commit_times):
+    """
+    Writer process: commit one collection every interval seconds until told to stop
+
+    Each add_member_counts call is one transaction that also updates the
+    totals and rollups; its duration goes into commit_times.
+    """
+    db = MemberDatabase(db_path, profile=profile, cache_size=0)
+    run_index = first_run
+    ready.set()
+    while not stop.is_set():
+        start = time.perf_counter()
+        db.add_member_counts({group: 2000 + idx for idx, group in enumerate(groups)},
+                             timestamp=START + timedelta(hours=run_index))
+        elapsed = time.perf_counter() - start
+        commit_times.append(elapsed)
+        run_index += 1
+        stop.wait(max(0.0, interval - elapsed))
+    db.close()
+
+
+def read_for(db, threads, seconds, page=latest_view):
+    """
+    Page loads from threads workers, back to back, for a fixed time
+
+    Returns:
+        (seconds, errors, per-load latencies in seconds)
+    """
+    errors = []
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    def viewer():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                page(db)
+            except Exception as e:
+                errors.append(e)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=viewer) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start, errors, latencies
+
+
+def run_during_write(db_path, profile, groups, args):
+    """
+    Page loads while a separate process commits collections
+
+    Returns:
+        (seconds, errors, latencies) as for run(), and the writer's commit durations in seconds
+    """
+    db = MemberDatabase(db_path, profile=profile, pool_size=args.threads, cache_size=0)
+    ctx = multiprocessing.get_context('spawn')
+    ready, stop = ctx.Event(), ctx.Event()
+    with ctx.Manager() as manager:
+        commit_times = manager.list()
+        writer = ctx.Process(target=write_collections,
+                             args=(db_path, profile, groups, args.runs, args.write_interval,
+                                   ready, stop, commit_times))
+        writer.start()
+        ready.wait()
+        try:
+            result = read_for(db, args.threads, args.seconds)
+        finally:
+            stop.set()
+            writer.join()
+            db.close()
+        return result, list(commit_times)
+
+
+def p95(latencies):
+    """95th percentile of a list of durations"""
+    return statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else max(latencies, default=0.0)
+
+
+def report(label, reruns, seconds, errors, latencies):
+    """Print one pass's throughput, latency and errors"""
+    print(f"{label:<34} {seconds:6.2f}s ({reruns / seconds:6.1f} loads/s, "
+          f"p95 {p95(latencies) * 1000:6.0f} ms, {len(errors)} errors)")
+    for error in errors[:3]:
+        print(f"  {type(error).__name__}: {error}")
+
+
+def main():
+    """Run the load test"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=2000, help="collections stored in the test database")
+    parser.add_argument('--threads', type=int, default=8, help="concurrent viewers")
+    parser.add_argument('--reruns', type=int, default=200, help="total page loads")
+    parser.add_argument('--seconds', type=float, default=10.0,
+                        help="how long the readers run during collections, per profile")
+    parser.add_argument('--write-interval', type=float, default=0.2,
+                        help="seconds between the starts of the writer's collections")
+    args = parser.parse_args()
+
+    groups = get_registry().names
+    print(f"{args.runs:,} collections x {len(groups)} groups, {args.threads} threads, {args.reruns} page loads, "
+          f"{os.cpu_count()} CPUs\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 1. Session model
+        db = MemberDatabase(str(Path(tmp) / 'sessions.db'), profile='wal', pool_size=args.threads, cache_size=0)
+        populate(db, args.runs, groups)
+        dashboard_rerun(db)  # Warm the page cache so both passes see the same I/O
+
+        serial = run(db, args.threads, args.reruns, lock=threading.Lock())
+        pooled = run(db, args.threads, args.reruns)
+        db.close()
+
+        report("Serialized (one shared session):", args.reruns, *serial)
+        report("Pooled sessions:", args.reruns, *pooled)
+        print(f"Speedup: {(serial[0] / pooled[0]):.1f}x\n")
+
+        # 2. Readers during collections, per journal mode (WAL is persistent, so one file each)
+        during = {}
+        for profile in ('default', 'wal'):
+            db_path = str(Path(tmp) / f'{profile}.db')
+            db = MemberDatabase(db_path, profile=profile, cache_size=0)
+            populate(db, args.runs, groups)
+            db.close()
+            result, commit_times = run_during_write(db_path, profile, groups, args)
+            seconds, _, latencies = result
+            during[profile] = (len(latencies) / seconds, p95(latencies), statistics.median(commit_times))
+            report(f"During collections, '{profile}':", len(latencies), *result)
+            print(f"  writer: {len(commit_times)} collections, commit p50 "
+                  f"{statistics.median(commit_times) * 1000:.0f} ms, max {max(commit_times) * 1000:.0f} ms")
+
+        default, wal = during['default'], during['wal']
+        print(f"WAL vs default: readers {wal[0] / default[0]:.2f}x loads/s, p95 {wal[1] / default[1]:.2f}x, "
+              f"commit p50 {wal[2] / default[2]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
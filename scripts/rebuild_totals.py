@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Rebuild the precomputed collection and region totals and group rollups from member_counts
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.database import MemberDatabase
+
+
+def main():
+    """Rebuild the totals and rollup tables"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--db', default='data/members.db', help="SQLite database to rebuild")
+    args = parser.parse_args()
+
+    db = MemberDatabase(args.db, profile='wal')
+    collections = db.rebuild_totals()
+    db.close()
+
+    print(f"✅ Rebuilt totals for {collections} collections in {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Paginated grid of per-group metrics and sparklines
+"""
+import math
+from datetime import datetime
+from typing import Hashable, List, Optional, Tuple
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from src.data.analytics import GroupDeltas
+from src.data.registry import GroupRegistry
+from src.data.series_store import MISSING, SeriesStore
+from src.utils.downsample import downsample, point_budget
+
+# Approximate rendered width of one grid cell in the wide layout (sets the point budget)
+SPARKLINE_WIDTH_PX = 450
+
+
+def sparkline_figure(times: np.ndarray, counts: np.ndarray, color: str) -> go.Figure:
+    """
+    Build the compact chart shown under a group's metric
+
+    Args:
+        times: Run timestamps
+        counts: Member counts aligned with times
+        color: Hex colour of the group
+    """
+    spark_x, spark_y = downsample(times, counts, point_budget(SPARKLINE_WIDTH_PX))
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=spark_x,
+        y=spark_y,
+        mode='lines' if len(spark_x) < len(times) else 'lines+markers',
+        line=dict(color=color, width=2),
+        marker=dict(size=5, color=color),
+        fill='tozeroy',
+        fillcolor=f'rgba({int(color[1:3], 16)}, {int(color[3:5], 16)}, {int(color[5:7], 16)}, 0.1)',
+        hovertemplate='%{y:,}<extra></extra>'
+    ))
+
+    fig.update_layout(
+        height=150,
+        margin=dict(l=0, r=0, t=0, b=0),
+        showlegend=False,
+        plot_bgcolor='#2d2d2d',
+        paper_bgcolor='#2d2d2d',
+        xaxis=dict(showticklabels=False, showgrid=False, color='#9aa0a6'),
+        yaxis=dict(showticklabels=False, showgrid=False, color='#9aa0a6'),
+        font=dict(color='#e8eaed')
+    )
+    return fig
+
+
+@st.cache_data(max_entries=1024)
+def _group_card(data_version: Hashable, group_name: str, start: Optional[datetime], end: Optional[datetime],
+                color: str, _store: SeriesStore) -> Tuple[int, dict]:
+    """Number of points in the window and the sparkline (as a Plotly dict), memoized per data version"""
+    times, counts = _store.series(group_name, start, end)
+    present = counts != MISSING
+    times, counts = times[present], counts[present]
+    return len(counts), sparkline_figure(times, counts, color).to_dict()
+
+
+def render_group_grid(groups: List[str], store: SeriesStore, growth: GroupDeltas, registry: GroupRegistry,
+                      start: Optional[datetime] = None, end: Optional[datetime] = None,
+                      page_size: int = 12, cols_per_row: int = 3, key: str = "group_grid",
+                      data_version: Hashable = None):
+    """
+    Render one page of group metrics and sparklines
+
+    Only the groups on the current page get a figure built and sent to the
+    browser, so a rerun costs the same however many groups are tracked.
+
+    Args:
+        groups: Groups to show, in display order
+        store: Series store holding the runs
+        growth: window_deltas result for the same time window
+        registry: Group registry (for colours)
+        start: Earliest time to plot (None = from the beginning)
+        end: Latest time to plot (None = up to the latest run)
+        page_size: Groups per page
+        cols_per_row: Grid columns
+        key: Widget key prefix, unique per grid on the page
+        data_version: Changes whenever the store's data does; figures are
+            memoized per (data_version, group, window)
+    """
+    # Groups with nothing in the window have no card
+    groups = [g for g in groups if g in growth]
+    if not groups:
+        return
+
+    pages = math.ceil(len(groups) / page_size)
+    page = 1
+    if pages > 1:
+        col_page, col_info = st.columns([1, 3])
+        with col_page:
+            page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1,
+                                   key=f"{key}_page", label_visibility="collapsed")
+        with col_info:
+            first = (page - 1) * page_size
+            st.caption(f"Groups {first + 1}–{min(first + page_size, len(groups))} of {len(groups)} "
+                       f"(page {page} of {pages})")
+
+    visible = groups[(page - 1) * page_size:page * page_size]
+
+    for i in range(0, len(visible), cols_per_row):
+        cols = st.columns(cols_per_row)
+
+        for col, group_name in zip(cols, visible[i:i + cols_per_row]):
+            points, fig = _group_card(data_version, group_name, start, end, registry.color(group_name), store)
+
+            with col:
+                # Compact metric
+                latest_count, change = growth.get(group_name)
+                if points > 1:
+                    st.metric(group_name, f"{latest_count:,.0f}", f"{change:+,}")
+                else:
+                    st.metric(group_name, f"{latest_count:,.0f}")
+
+                st.plotly_chart(fig, use_container_width=True, key=f"{key}_chart_{group_name}")
@@ -0,0 +1,196 @@
+"""
+Vectorized group and region deltas for the dashboard
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.registry import GroupRegistry
+from src.data.series_store import MISSING, SeriesStore
+
+
+@dataclass
+class GroupDeltas:
+    """Per-group counts at two points and the change between them, as aligned arrays"""
+    groups: np.ndarray
+    current: np.ndarray
+    previous: np.ndarray
+    delta: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        self.delta = self.current - self.previous
+        self._index = {name: i for i, name in enumerate(self.groups)}
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def get(self, name: str) -> Optional[Tuple[int, int]]:
+        """(current, delta) for a group, or None if it has no current count"""
+        i = self._index.get(name)
+        if i is None:
+            return None
+        return int(self.current[i]), int(self.delta[i])
+
+    def as_dict(self) -> Dict[str, int]:
+        """Group name -> current count"""
+        return dict(zip(self.groups.tolist(), self.current.tolist()))
+
+
+@dataclass
+class RegionDeltas:
+    """Per-region totals at two points, largest region first"""
+    regions: np.ndarray
+    current: np.ndarray
+    previous: np.ndarray
+    delta: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        self.delta = self.current - self.previous
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+
+@dataclass
+class Overview:
+    """Headline numbers of the latest run, against the run before it"""
+    total: int
+    previous_total: Optional[int]   # None when there is no earlier run
+    group_count: int
+    largest_group: Optional[str]
+    largest_count: Optional[int]
+
+    @property
+    def growth(self) -> int:
+        """Change in total members (0 without an earlier run)"""
+        return 0 if self.previous_total is None else self.total - self.previous_total
+
+    @property
+    def growth_pct(self) -> float:
+        """Change in total members as a percentage of the earlier total"""
+        return self.growth / self.previous_total * 100 if self.previous_total else 0.0
+
+
+def overview_metrics(snapshots: pd.DataFrame, latest_run: int,
+                     previous_run: Optional[int] = None) -> Overview:
+    """
+    Headline numbers for the Overview section
+
+    Args:
+        snapshots: get_snapshots result containing the runs
+        latest_run: Run id of the latest collection
+        previous_run: Run id to compare totals against (None = no comparison)
+
+    Returns:
+        Overview; ties for the largest group go to the first name alphabetically
+    """
+    latest = snapshots[snapshots['run_id'] == latest_run].sort_values('group_name', kind='stable')
+    counts = latest['member_count'].to_numpy(dtype=np.int64)
+    previous_total = None
+    if previous_run is not None:
+        previous_total = int(snapshots.loc[snapshots['run_id'] == previous_run, 'member_count'].sum())
+    largest = int(np.argmax(counts)) if len(counts) else None
+    return Overview(
+        total=int(counts.sum()),
+        previous_total=previous_total,
+        group_count=len(counts),
+        largest_group=None if largest is None else str(latest['group_name'].iloc[largest]),
+        largest_count=None if largest is None else int(counts[largest]),
+    )
+
+
+def compare_runs(snapshots: pd.DataFrame, from_run: int, to_run: int,
+                 registry: GroupRegistry) -> Tuple[GroupDeltas, RegionDeltas]:
+    """
+    Group and region deltas between two collection runs
+
+    One pivot turns the snapshots into a groups x runs table; everything
+    after that is array arithmetic, so the cost doesn't depend on how many
+    groups or regions there are.
+
+    Args:
+        snapshots: get_snapshots result containing both runs
+        from_run: Run id to compare against
+        to_run: Run id to compare
+        registry: Registry assigning groups to regions
+
+    Returns:
+        (GroupDeltas, RegionDeltas). Groups are those with a count in to_run,
+        sorted by name; a group missing from from_run shows no change. Region
+        totals treat missing counts as 0 and cover every registry region.
+    """
+    wide = snapshots.pivot(index='group_name', columns='run_id', values='member_count')
+    names = wide.index.to_numpy(dtype=object)
+    to_counts = wide[to_run].to_numpy(dtype=float) if to_run in wide else np.full(len(names), np.nan)
+    from_counts = wide[from_run].to_numpy(dtype=float) if from_run in wide else np.full(len(names), np.nan)
+
+    present = ~np.isnan(to_counts)
+    current = to_counts[present].astype(np.int64)
+    previous = np.where(np.isnan(from_counts), to_counts, from_counts)[present].astype(np.int64)
+    group_deltas = GroupDeltas(names[present], current, previous)
+
+    region_names = list(registry.regions)
+    region_index = {region: i for i, region in enumerate(region_names)}
+    codes = np.array([region_index.get(registry.region_of(name), -1) for name in names], dtype=np.intp)
+    known = codes >= 0
+
+    def totals(counts):
+        weights = np.nan_to_num(counts[known])
+        return np.rint(np.bincount(codes[known], weights=weights, minlength=len(region_names))).astype(np.int64)
+
+    region_current = totals(to_counts)
+    region_previous = totals(from_counts)
+    order = np.argsort(-region_current, kind='stable')
+    region_deltas = RegionDeltas(
+        np.asarray(region_names, dtype=object)[order],
+        region_current[order],
+        region_previous[order],
+    )
+    return group_deltas, region_deltas
+
+
+def summary_text(group_deltas: GroupDeltas) -> str:
+    """Copy-pastable "Group: count (delta)" lines for the Text Summary box"""
+    lines = []
+    for group_name, current_count, delta in zip(group_deltas.groups.tolist(), group_deltas.current.tolist(),
+                                                group_deltas.delta.tolist()):
+        delta_str = f"({delta:+d})" if delta != 0 else "(0)"
+        lines.append(f"{group_name}: {current_count} {delta_str}")
+    return "\n".join(lines)
+
+
+def window_deltas(store: SeriesStore, start: Optional[datetime] = None,
+                  end: Optional[datetime] = None) -> GroupDeltas:
+    """
+    First-to-last change for every group within a time window
+
+    Args:
+        store: Series store holding the runs
+        start: Earliest time to include (None = from the beginning)
+        end: Latest time to include (None = up to the latest run)
+
+    Returns:
+        GroupDeltas for groups with at least one count in the window, where
+        previous is the group's first count in the window and current its last
+    """
+    names, window = store.labelled_window(start, end)
+    valid = window != MISSING
+    has_data = valid.any(axis=1)
+    if window.shape[1] == 0 or not has_data.any():
+        empty = np.empty(0, dtype=np.int64)
+        return GroupDeltas(np.empty(0, dtype=object), empty, empty)
+
+    first = valid.argmax(axis=1)
+    last = window.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+    rows = np.arange(window.shape[0])
+    return GroupDeltas(
+        names[has_data],
+        window[rows, last][has_data].astype(np.int64),
+        window[rows, first][has_data].astype(np.int64),
+    )
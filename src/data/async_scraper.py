@@ -0,0 +1,346 @@
+"""
+asyncio-based scraper for Telegram and Discord member counts
+"""
+import asyncio
+import json
+import time
+from typing import Callable, Dict, Optional, TypeVar
+import aiohttp
+
+from src.data.http_cache import DEFAULT_TTL, HttpCache, get_http_cache
+from src.data.registry import GroupRegistry
+from src.data.retry import RetryPolicy, ScrapeOutcome
+from src.data.scraper import MemberScraper, primary_discord
+from src.utils.rate_limit import HostRateLimiter
+
+T = TypeVar('T')
+
+
+class AsyncMemberScraper:
+    """
+    Async counterpart to MemberScraper
+
+    All Telegram pages and Discord Invite API calls run on one event loop
+    over a single keep-alive connection pool. Pass an existing
+    aiohttp.ClientSession to share that pool between several scrapers
+    (e.g. when collecting for more than one community in the same process).
+    """
+
+    TELEGRAM_GROUPS = MemberScraper.TELEGRAM_GROUPS
+    DISCORD_SERVERS = MemberScraper.DISCORD_SERVERS
+    DISCORD_SERVER = MemberScraper.DISCORD_SERVER
+    DISCORD_NAME = MemberScraper.DISCORD_NAME
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+    def __init__(self, use_selenium: bool = False, max_connections: int = 8,
+                 requests_per_second: float = 4.0, burst: Optional[float] = None,
+                 session: Optional[aiohttp.ClientSession] = None, use_cache: bool = True,
+                 cache_ttl: float = DEFAULT_TTL, http_cache: Optional[HttpCache] = None,
+                 retry_policy: Optional[RetryPolicy] = None, registry: Optional[GroupRegistry] = None):
+        """
+        Initialize the scraper
+
+        Args:
+            use_selenium: If True, fall back to Selenium when the Discord API fails
+            max_connections: Size of the shared connection pool
+            requests_per_second: Politeness limit applied to each host
+            burst: Requests a host may receive back-to-back before throttling
+            session: Optional shared aiohttp session (not closed by this scraper)
+            use_cache: If True, serve and revalidate responses through the on-disk HTTP cache
+            cache_ttl: Seconds a cached response is reused without any network request
+            http_cache: Cache to use (defaults to the shared cache file)
+            retry_policy: Retry/backoff/circuit-breaker policy for every fetch
+            registry: Groups to scrape (defaults to data/groups.json)
+        """
+        if registry is not None:
+            self.TELEGRAM_GROUPS = registry.urls('telegram')
+            self.DISCORD_SERVERS = registry.urls('discord')
+            self.DISCORD_SERVER, self.DISCORD_NAME = primary_discord(registry)
+
+        self.use_selenium = use_selenium
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.max_connections = max(1, max_connections)
+        self.rate_limiter = HostRateLimiter(requests_per_second, burst)
+        self.timeout = aiohttp.ClientTimeout(total=10)
+        self.cache_ttl = cache_ttl
+        self.http_cache = (http_cache or get_http_cache()) if use_cache else None
+
+        self.session = session
+        self._owns_session = session is None
+
+    async def __aenter__(self):
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session on first use"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': self.USER_AGENT},
+                timeout=self.timeout,
+            )
+            self._owns_session = True
+        return self.session
+
+    async def close(self):
+        """Close the session if this scraper created it"""
+        if self._owns_session and self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def _fetch(self, url: str, parse: Callable[[bytes], Optional[T]]) -> Optional[T]:
+        """
+        GET a URL through the HTTP cache and the per-host rate limiter, and parse it
+
+        As MemberScraper._fetch: only responses parse finds a value in are cached.
+        The SQLite cache calls and the parse (BeautifulSoup on the fallback
+        path) run in worker threads so they don't stall the other fetches.
+
+        Args:
+            url: URL to fetch
+            parse: Turns the body into a value (None if the page has none)
+
+        Returns:
+            The parsed value, or None if the page had none
+        """
+        entry = await asyncio.to_thread(self.http_cache.lookup, url) if self.http_cache else None
+        if entry is not None and self.http_cache.is_fresh(entry, self.cache_ttl):
+            value = await asyncio.to_thread(parse, entry.body)
+            if value is not None:
+                return value
+            entry = None  # Unusable cached body: fetch it again unconditionally
+
+        session = await self._ensure_session()
+        await self.rate_limiter.acquire_async(url)
+        try:
+            response = await session.get(url, headers=HttpCache.conditional_headers(entry))
+        except Exception:
+            self.rate_limiter.failed(url)
+            raise
+        async with response:
+            self.rate_limiter.observe(url, response.status, response.headers)
+            if response.status == 304 and entry is not None:
+                value = await asyncio.to_thread(parse, entry.body)
+                if value is not None:
+                    await asyncio.to_thread(self.http_cache.touch, entry)
+                return value
+
+            response.raise_for_status()
+            body = await response.read()
+
+        value = await asyncio.to_thread(parse, body)
+        if value is not None and self.http_cache:
+            await asyncio.to_thread(self.http_cache.store, url, body, response.headers)
+        return value
+
+    async def scrape_telegram_outcome(self, name: str, url: str) -> ScrapeOutcome:
+        """
+        Scrape one Telegram group under the retry policy
+
+        Args:
+            name: Group display name
+            url: Telegram group URL
+
+        Returns:
+            ScrapeOutcome with the count, attempts, latency and final error
+        """
+        async def attempt():
+            return await self._fetch(url, MemberScraper.parse_telegram_page)
+
+        outcome = await self.retry_policy.call_async(name, RetryPolicy.source_for(url), attempt)
+        if not outcome.ok:
+            print(f"Error scraping Telegram {url}: {outcome.error}")
+        return outcome
+
+    async def scrape_telegram_group(self, url: str) -> Optional[int]:
+        """
+        Scrape member count from a Telegram group
+
+        Args:
+            url: Telegram group URL
+
+        Returns:
+            Member count or None if scraping fails
+        """
+        return (await self.scrape_telegram_outcome(url, url)).count
+
+    async def _discord_api_outcome(self, name: str, invite_url: str) -> ScrapeOutcome:
+        """Query the public Invite API for one server under the retry policy"""
+        url = MemberScraper.discord_invite_api_url(invite_url)
+
+        async def attempt():
+            return await self._fetch(url, lambda body: MemberScraper.parse_discord_invite(json.loads(body)))
+
+        outcome = await self.retry_policy.call_async(name, RetryPolicy.source_for(url), attempt)
+        if not outcome.ok:
+            print(f"Error scraping Discord with API: {outcome.error}")
+        return outcome
+
+    async def _scrape_discord_api(self) -> Optional[int]:
+        """Scrape Discord using public Invite API (no auth needed)"""
+        if self.DISCORD_SERVER is None:
+            return None
+        return (await self._discord_api_outcome(self.DISCORD_NAME, self.DISCORD_SERVER)).count
+
+    async def scrape_discord_outcome(self, name: Optional[str] = None) -> ScrapeOutcome:
+        """
+        Scrape one Discord server, with the Selenium fallback if enabled
+
+        Args:
+            name: Display name of the server (defaults to the primary server)
+
+        Returns:
+            ScrapeOutcome with the count, attempts, latency and final error
+        """
+        name = name or self.DISCORD_NAME
+        if name is None:
+            return ScrapeOutcome('Discord', None, 0, 0.0, "no Discord server configured")
+        invite_url = self.DISCORD_SERVERS[name]
+
+        outcome = await self._discord_api_outcome(name, invite_url)
+        if outcome.ok or not self.use_selenium:
+            return outcome
+
+        # Selenium is blocking, so keep it off the event loop
+        start = time.monotonic()
+        selenium_scraper = MemberScraper(use_selenium=True, use_cache=False)
+        count = await asyncio.to_thread(selenium_scraper._scrape_discord_selenium, invite_url)
+        return ScrapeOutcome(
+            name=name,
+            count=count,
+            attempts=outcome.attempts + 1,
+            latency=outcome.latency + time.monotonic() - start,
+            error=None if count is not None else f"{outcome.error}; Selenium fallback failed",
+        )
+
+    async def scrape_discord_server(self, name: Optional[str] = None) -> Optional[int]:
+        """
+        Scrape member count from Discord
+
+        Args:
+            name: Display name of the server (defaults to the primary server)
+
+        Returns:
+            Member count or None if scraping fails
+        """
+        return (await self.scrape_discord_outcome(name)).count
+
+    async def _scrape_telegram_named(self, name: str, url: str) -> ScrapeOutcome:
+        """Scrape one Telegram group, logging its display name"""
+        print(f"Scraping {name}...")
+        return await self.scrape_telegram_outcome(name, url)
+
+    async def scrape_all_telegram_outcomes(self) -> Dict[str, ScrapeOutcome]:
+        """
+        Scrape all Telegram groups concurrently
+
+        Returns:
+            Dictionary mapping group names to scrape outcomes
+        """
+        names = list(self.TELEGRAM_GROUPS)
+        outcomes = await asyncio.gather(*(
+            self._scrape_telegram_named(name, self.TELEGRAM_GROUPS[name]) for name in names
+        ))
+        return dict(zip(names, outcomes))
+
+    async def scrape_all_telegram(self) -> Dict[str, Optional[int]]:
+        """
+        Scrape all Telegram groups concurrently
+
+        Returns:
+            Dictionary mapping group names to member counts
+        """
+        return {name: outcome.count for name, outcome in (await self.scrape_all_telegram_outcomes()).items()}
+
+    async def _scrape_discord_named(self, name: str) -> ScrapeOutcome:
+        """Scrape one Discord server, logging its display name"""
+        print(f"Scraping {name}...")
+        return await self.scrape_discord_outcome(name)
+
+    async def scrape_all_discord_outcomes(self) -> Dict[str, ScrapeOutcome]:
+        """
+        Scrape every configured Discord server concurrently
+
+        Invite API calls share the pooled session and are paced by the
+        X-RateLimit-* / Retry-After headers Discord returns.
+
+        Returns:
+            Dictionary mapping server names to scrape outcomes
+        """
+        names = list(self.DISCORD_SERVERS)
+        outcomes = await asyncio.gather(*(self._scrape_discord_named(name) for name in names))
+        return dict(zip(names, outcomes))
+
+    async def scrape_all_outcomes(self) -> Dict[str, ScrapeOutcome]:
+        """
+        Scrape all groups (Telegram + Discord) on one event loop
+
+        Returns:
+            Dictionary mapping group names to scrape outcomes
+        """
+        # Only tear down a session this call had to open itself
+        opened_here = self.session is None or self.session.closed
+        await self._ensure_session()
+        try:
+            results, discord_results = await asyncio.gather(
+                self.scrape_all_telegram_outcomes(),
+                self.scrape_all_discord_outcomes(),
+            )
+        finally:
+            if opened_here:
+                await self.close()
+
+        results.update(discord_results)
+        return results
+
+    async def scrape_all(self) -> Dict[str, Optional[int]]:
+        """
+        Scrape all groups (Telegram + Discord) on one event loop
+
+        Returns:
+            Dictionary mapping group names to member counts
+        """
+        return {name: outcome.count for name, outcome in (await self.scrape_all_outcomes()).items()}
+
+
+def scrape_all_outcomes(**kwargs) -> Dict[str, ScrapeOutcome]:
+    """
+    Run AsyncMemberScraper.scrape_all_outcomes from synchronous code
+
+    Args:
+        **kwargs: Passed through to AsyncMemberScraper
+
+    Returns:
+        Dictionary mapping group names to scrape outcomes
+    """
+    return asyncio.run(AsyncMemberScraper(**kwargs).scrape_all_outcomes())
+
+
+def scrape_all(**kwargs) -> Dict[str, Optional[int]]:
+    """
+    Run AsyncMemberScraper.scrape_all from synchronous code
+
+    Args:
+        **kwargs: Passed through to AsyncMemberScraper
+
+    Returns:
+        Dictionary mapping group names to member counts
+    """
+    return asyncio.run(AsyncMemberScraper(**kwargs).scrape_all())
+
+
+if __name__ == "__main__":
+    # Test the async scraper
+    results = scrape_all()
+
+    print("\n--- Results ---")
+    for name, count in results.items():
+        if count:
+            print(f"{name}: {count:,} members")
+        else:
+            print(f"{name}: Failed to scrape")
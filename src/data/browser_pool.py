@@ -0,0 +1,230 @@
+"""
+Reusable pool of headless Chrome browsers for Selenium-backed scrapes
+"""
+import atexit
+import os
+import queue
+import re
+import subprocess
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+# Where the resolved chromedriver path is remembered between runs
+DRIVER_CACHE_FILE = Path.home() / '.cache' / 'conflux-tracker' / 'chromedriver_path'
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Chrome binaries whose --version output identifies the installed browser
+CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser')
+
+
+def chrome_version() -> Optional[str]:
+    """Version string of the installed Chrome (e.g. '126.0.6478.126'), or None if it can't be found"""
+    for binary in CHROME_BINARIES:
+        try:
+            output = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r'\d+(?:\.\d+)+', output)
+        if match:
+            return match.group(0)
+    return None
+
+
+def resolve_chromedriver(cache_file: Path = DRIVER_CACHE_FILE, refresh: bool = False) -> str:
+    """
+    Get the chromedriver binary path, resolving it through webdriver-manager only once
+
+    The cache file holds the driver path and the Chrome version it was
+    resolved for; once Chrome is upgraded the cached path is ignored.
+
+    Args:
+        cache_file: File the resolved path is stored in
+        refresh: Ignore the cached path and resolve again
+
+    Returns:
+        Path to the chromedriver executable
+    """
+    version = chrome_version()
+    if not refresh and cache_file.exists():
+        lines = cache_file.read_text().splitlines()
+        cached = lines[0].strip() if lines else ''
+        cached_version = lines[1].strip() if len(lines) > 1 else None
+        if cached and os.access(cached, os.X_OK) and (version is None or cached_version == version):
+            return cached
+
+    path = ChromeDriverManager().install()
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(f"{path}\n{version or ''}\n")
+    return path
+
+
+def chrome_options() -> Options:
+    """Headless Chrome options used for every pooled browser"""
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument(f'--user-agent={USER_AGENT}')
+    return options
+
+
+class BrowserPool:
+    """
+    Fixed-size pool of warm headless browsers
+
+    Browsers are started lazily (or up front with warm_up()), lent out with
+    browser(), and quit and replaced after max_pages borrows so long runs
+    don't accumulate Chrome memory.
+    """
+
+    def __init__(self, size: int = 1, max_pages: int = 50, driver_cache_file: Path = DRIVER_CACHE_FILE):
+        """
+        Initialize the pool
+
+        Args:
+            size: Maximum number of browsers alive at once
+            max_pages: Recycle a browser after it has served this many borrows
+            driver_cache_file: Where the chromedriver path is cached on disk
+        """
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self.driver_cache_file = driver_cache_file
+
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._pages: Dict[int, int] = {}
+        self._created = 0
+        self._driver_path: Optional[str] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _start_browser(self) -> webdriver.Chrome:
+        """Launch one headless Chrome, re-resolving the driver if the cached one is stale"""
+        if self._driver_path is None:
+            self._driver_path = resolve_chromedriver(self.driver_cache_file)
+
+        try:
+            driver = webdriver.Chrome(service=Service(self._driver_path), options=chrome_options())
+        except WebDriverException:
+            # Chrome was probably upgraded past the cached driver version
+            self._driver_path = resolve_chromedriver(self.driver_cache_file, refresh=True)
+            driver = webdriver.Chrome(service=Service(self._driver_path), options=chrome_options())
+
+        with self._lock:
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver: webdriver.Chrome):
+        """Quit a browser and free its slot"""
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            self._created -= 1
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+    def _checkout(self, timeout: Optional[float]) -> webdriver.Chrome:
+        """Take an idle browser, starting a new one if the pool has room"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_start = self._created < self.size
+            if can_start:
+                self._created += 1
+
+        if can_start:
+            try:
+                return self._start_browser()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        return self._idle.get(timeout=timeout)
+
+    def warm_up(self, count: Optional[int] = None):
+        """
+        Start browsers ahead of time so the first scrape doesn't pay the launch cost
+
+        Args:
+            count: Number of browsers to start (defaults to the pool size)
+        """
+        count = min(self.size, count or self.size)
+        warmed = []
+        while len(warmed) < count and self._created < self.size:
+            warmed.append(self._checkout(timeout=None))
+        for driver in warmed:
+            self._idle.put(driver)
+
+    @contextmanager
+    def browser(self, timeout: Optional[float] = 60) -> Iterator[webdriver.Chrome]:
+        """
+        Borrow a browser for the duration of a with-block
+
+        A browser that raised inside the block is quit rather than returned,
+        since its state can't be trusted (a plain wait timeout is not held
+        against it).
+
+        Args:
+            timeout: Seconds to wait for a free browser when all are busy
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+
+        driver = self._checkout(timeout)
+        healthy = True
+        try:
+            yield driver
+        except TimeoutException:
+            raise
+        except BaseException:
+            healthy = False
+            raise
+        finally:
+            with self._lock:
+                self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+                worn_out = self._pages[id(driver)] >= self.max_pages
+
+            if healthy and not worn_out and not self._closed:
+                self._idle.put(driver)
+            else:
+                self._discard(driver)
+
+    def close(self):
+        """Quit every idle browser and stop lending new ones"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+
+_default_pool: Optional[BrowserPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the process-wide browser pool shared by all Selenium scrapes"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = BrowserPool(
+                size=int(os.environ.get('BROWSER_POOL_SIZE', 1)),
+                max_pages=int(os.environ.get('BROWSER_POOL_MAX_PAGES', 50)),
+            )
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -1,16 +1,52 @@
 """
 Database module for storing and retrieving member count data
 """
-from datetime import datetime
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import pandas as pd
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Index
+from sqlalchemy import (
+    bindparam, create_engine, delete, event, func, inspect, literal, select,
+    Column, DateTime, ForeignKey, Index, Integer, String
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from src.data.query_cache import QueryCache, cached_query
+from src.data.registry import GroupRegistry, get_registry
 
 Base = declarative_base()
 
+# SQLite PRAGMA profiles, applied to every new connection
+PERFORMANCE_PROFILES = {
+    # SQLite defaults: rollback journal, writers block readers
+    'default': {},
+    # WAL lets dashboard readers keep reading while a collection writes
+    'wal': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,          # ms to wait on a lock instead of failing
+        'cache_size': -64000,          # negative = KiB, so ~64 MB of page cache
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+
+class Group(Base):
+    """Group names, stored once and referenced by id from the per-collection tables"""
+    __tablename__ = 'groups'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False, unique=True)
+
+    def __repr__(self):
+        return f"<Group(id={self.id}, name={self.name})>"
+
 
 class MemberCount(Base):
     """Table for storing member counts"""
@@ -18,36 +54,328 @@ class MemberCount(Base):
 
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, nullable=False, index=True)
-    group_name = Column(String(50), nullable=False, index=True)
+    group_id = Column(Integer, ForeignKey('groups.id'), nullable=False)
     member_count = Column(Integer, nullable=False)
 
-    # Composite index for efficient queries
+    # Composite index for efficient queries (also serves lookups by group alone)
     __table_args__ = (
-        Index('idx_group_timestamp', 'group_name', 'timestamp'),
+        Index('idx_group_timestamp', 'group_id', 'timestamp'),
     )
 
     def __repr__(self):
-        return f"<MemberCount(group={self.group_name}, count={self.member_count}, time={self.timestamp})>"
+        return f"<MemberCount(group_id={self.group_id}, count={self.member_count}, time={self.timestamp})>"
+
+
+class CollectionRun(Base):
+    """One collection: every member count stored with its start time belongs to it"""
+    __tablename__ = 'collection_runs'
+
+    id = Column(Integer, primary_key=True)
+    started_at = Column(DateTime, nullable=False, unique=True)
+    status = Column(String(20), nullable=False)
+
+    def __repr__(self):
+        return f"<CollectionRun(id={self.id}, started={self.started_at}, status={self.status})>"
+
+
+# CollectionRun.status values
+RUN_COMPLETE = 'complete'    # every group was scraped
+RUN_PARTIAL = 'partial'      # some groups failed
+RUN_FAILED = 'failed'        # nothing was stored
+
+
+class CollectionTotal(Base):
+    """Summed member counts per collection, maintained alongside member_counts"""
+    __tablename__ = 'collection_totals'
+
+    timestamp = Column(DateTime, primary_key=True)
+    total_members = Column(Integer, nullable=False)
+    group_count = Column(Integer, nullable=False)
+
+
+class RegionTotal(Base):
+    """Summed member counts per collection and region"""
+    __tablename__ = 'region_totals'
+
+    timestamp = Column(DateTime, primary_key=True)
+    region = Column(String(50), primary_key=True)
+    total_members = Column(Integer, nullable=False)
+    group_count = Column(Integer, nullable=False)
+
+
+class GroupRollup(Base):
+    """Per-group summary of the collections in one day, week or month"""
+    __tablename__ = 'group_rollups'
+
+    period = Column(String(5), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    group_id = Column(Integer, ForeignKey('groups.id'), primary_key=True)
+    first_count = Column(Integer, nullable=False)
+    last_count = Column(Integer, nullable=False)
+    min_count = Column(Integer, nullable=False)
+    max_count = Column(Integer, nullable=False)
+    delta = Column(Integer, nullable=False)
+    samples = Column(Integer, nullable=False)
+    last_timestamp = Column(DateTime, nullable=False)
+
+
+# Region used for groups that are not in the registry
+UNASSIGNED_REGION = 'Other'
+
+# Timestamps per IN (...) query when refreshing totals (well under SQLite's variable limit)
+TOTALS_BATCH_SIZE = 500
+
+# Rollup periods, finest first; weeks start on Monday
+ROLLUP_PERIODS = ('day', 'week', 'month')
+
+# Approximate length of each rollup period, used to pick one for a time range
+ROLLUP_PERIOD_DAYS = {'day': 1, 'week': 7, 'month': 30}
+
+# A rollup is only used if it still gives a range at least this many points
+ROLLUP_MIN_POINTS = 60
+
+
+def bucket_starts(timestamps: pd.Series, period: str) -> pd.Series:
+    """
+    Start of the rollup bucket each timestamp falls in
+
+    Args:
+        timestamps: Datetime Series
+        period: One of ROLLUP_PERIODS
+
+    Returns:
+        Datetime Series aligned with timestamps
+    """
+    days = timestamps.dt.normalize()
+    if period == 'day':
+        return days
+    if period == 'week':
+        return days - pd.to_timedelta(days.dt.weekday, unit='D')
+    if period == 'month':
+        return days - pd.to_timedelta(days.dt.day - 1, unit='D')
+    raise ValueError(f"Unknown rollup period: {period}")
+
+
+def _step_bucket(start: pd.Timestamp, period: str, n: int) -> pd.Timestamp:
+    """Start of the bucket n periods after (or before, if negative) the one starting at start"""
+    if period == 'month':
+        return start + pd.DateOffset(months=n)
+    return start + pd.Timedelta(days=n * ROLLUP_PERIOD_DAYS[period])
+
+
+def _bucket_index(starts: pd.Series, period: str) -> pd.Series:
+    """Number each bucket start so that consecutive buckets differ by exactly 1"""
+    if period == 'month':
+        return starts.dt.year * 12 + starts.dt.month
+    return (starts - pd.Timestamp(0)).dt.days // ROLLUP_PERIOD_DAYS[period]
+
+
+def _bucket_start(moment: datetime, period: str) -> datetime:
+    """Start of the rollup bucket one datetime falls in (bucket_starts for a scalar)"""
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'day':
+        return day
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    raise ValueError(f"Unknown rollup period: {period}")
+
+
+def _append_rollup_statement():
+    """Upsert folding one count into a rollup bucket (see MemberDatabase._append_rollups)"""
+    rollups = GroupRollup.__table__
+    previous = rollups.alias('previous')
+    previous_last = select(previous.c.last_count).where(
+        previous.c.period == bindparam('period'),
+        previous.c.bucket_start == bindparam('previous_start'),
+        previous.c.group_id == bindparam('group_id'),
+    ).scalar_subquery()
+
+    upsert = sqlite_insert(rollups).values(
+        period=bindparam('period'),
+        bucket_start=bindparam('bucket_start'),
+        group_id=bindparam('group_id'),
+        first_count=bindparam('count'),
+        last_count=bindparam('count'),
+        min_count=bindparam('count'),
+        max_count=bindparam('count'),
+        delta=bindparam('count') - func.coalesce(previous_last, bindparam('count')),
+        samples=1,
+        last_timestamp=bindparam('timestamp'),
+    )
+    return upsert.on_conflict_do_update(
+        index_elements=[rollups.c.period, rollups.c.bucket_start, rollups.c.group_id],
+        set_={
+            'last_count': upsert.excluded.last_count,
+            'min_count': func.min(rollups.c.min_count, upsert.excluded.min_count),
+            'max_count': func.max(rollups.c.max_count, upsert.excluded.max_count),
+            'delta': rollups.c.delta + upsert.excluded.last_count - rollups.c.last_count,
+            'samples': rollups.c.samples + 1,
+            'last_timestamp': upsert.excluded.last_timestamp,
+        },
+    )
+
+
+# Built once: constructing the statement costs more than running it
+_APPEND_ROLLUP = _append_rollup_statement()
 
 
 class MemberDatabase:
-    """Database manager for member counts"""
+    """
+    Database manager for member counts
 
-    def __init__(self, db_path: str = "data/members.db"):
+    One instance can be shared between threads (the dashboard caches a single
+    instance for every viewer): each call checks a connection out of the pool
+    for its own short-lived session, so concurrent reads run in parallel.
+    """
+
+    def __init__(self, db_path: str = "data/members.db", profile: Union[str, Dict[str, object]] = "default",
+                 pool_size: int = 8, max_overflow: int = 8, pool_timeout: float = 30.0,
+                 registry: Optional[GroupRegistry] = None, cache_size: int = 128):
         """
         Initialize database connection
 
         Args:
             db_path: Path to SQLite database file
+            profile: Name of a PERFORMANCE_PROFILES entry, or a dict of PRAGMA settings
+            pool_size: Connections kept open for concurrent callers
+            max_overflow: Extra connections opened under bursts of load
+            pool_timeout: Seconds to wait for a free connection before failing
+            registry: Group registry used to assign groups to regions
+            cache_size: Read results kept in the query cache (0 disables it)
         """
         # Create data directory if it doesn't exist
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        # Create engine and session
-        self.engine = create_engine(f'sqlite:///{db_path}')
+        self.pragmas = PERFORMANCE_PROFILES[profile] if isinstance(profile, str) else dict(profile)
+        self.registry = registry or get_registry()
+
+        # Reads are served from memory until the data changes. Writes by this
+        # instance bump the cache; writes by anyone else (the scheduled collector,
+        # another handle) show up in PRAGMA data_version, which data_version()
+        # checks on every call and reads check at most every few seconds
+        self._version_conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._version_lock = threading.Lock()
+        self.query_cache = QueryCache(cache_size, source_version=self._file_data_version)
+
+        # Create engine and session factories
+        self.engine = create_engine(
+            f'sqlite:///{db_path}',
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            connect_args={'check_same_thread': False},
+        )
+        event.listen(self.engine, 'connect', self._apply_pragmas)
         Base.metadata.create_all(self.engine)
-        Session = sessionmaker(bind=self.engine)
-        self.session = Session()
+        self._migrate_group_names()
+        self._session_factory = sessionmaker(bind=self.engine)
+        self._scoped_session = scoped_session(self._session_factory)
+
+        # Databases created before the runs/totals/rollup tables existed get them filled once
+        with self.engine.begin() as conn:
+            has_counts = conn.execute(select(MemberCount.id).limit(1)).first() is not None
+            has_runs = conn.execute(select(CollectionRun.id).limit(1)).first() is not None
+            has_totals = conn.execute(select(CollectionTotal.timestamp).limit(1)).first() is not None
+            has_rollups = conn.execute(select(GroupRollup.period).limit(1)).first() is not None
+            if has_counts and not has_runs:
+                self._backfill_runs(conn)
+        if has_counts and not (has_totals and has_rollups):
+            self.rebuild_totals()
+
+    def _migrate_group_names(self) -> bool:
+        """
+        Move a database that stores group names on every row to the groups table
+
+        member_counts is rebuilt with a group_id column (ids are assigned in
+        name order) and the file is vacuumed, so the space the repeated names
+        and their indexes took is returned. group_rollups is recreated empty
+        and refilled by rebuild_totals.
+
+        Returns:
+            True if the database needed migrating
+        """
+        inspector = inspect(self.engine)
+        if 'group_name' not in {column['name'] for column in inspector.get_columns('member_counts')}:
+            return False
+        old_rollups = 'group_name' in {column['name'] for column in inspector.get_columns('group_rollups')}
+
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT OR IGNORE INTO groups (name) "
+                "SELECT DISTINCT group_name FROM member_counts ORDER BY group_name"
+            )
+            # Index names are global in SQLite, so the old ones go before the table is recreated
+            for index in ('idx_group_timestamp', 'ix_member_counts_group_name', 'ix_member_counts_timestamp'):
+                conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index}")
+            conn.exec_driver_sql("ALTER TABLE member_counts RENAME TO member_counts_old")
+            MemberCount.__table__.create(conn)
+            conn.exec_driver_sql(
+                "INSERT INTO member_counts (id, timestamp, group_id, member_count) "
+                "SELECT m.id, m.timestamp, g.id, m.member_count "
+                "FROM member_counts_old m JOIN groups g ON g.name = m.group_name"
+            )
+            conn.exec_driver_sql("DROP TABLE member_counts_old")
+
+            if old_rollups:
+                GroupRollup.__table__.drop(conn)
+                GroupRollup.__table__.create(conn)
+
+        with self.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.exec_driver_sql("VACUUM")
+        return True
+
+    @staticmethod
+    def _group_ids(conn, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Ids of some groups, adding any that are not in the groups table yet
+
+        Args:
+            conn: Connection inside the transaction that writes the counts
+            names: Group names
+
+        Returns:
+            Dictionary mapping each name to its id
+        """
+        names = sorted(set(names))
+        if not names:
+            return {}
+        groups = Group.__table__
+        conn.execute(sqlite_insert(groups).on_conflict_do_nothing(index_elements=['name']),
+                     [{'name': name} for name in names])
+        rows = conn.execute(select(groups.c.name, groups.c.id).where(groups.c.name.in_(names)))
+        return dict(rows.all())
+
+    @property
+    def session(self) -> Session:
+        """Thread-local session, for callers that need ORM access beyond this API"""
+        return self._scoped_session()
+
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """
+        Short-lived session for one unit of work
+
+        Commits if the block succeeds, rolls back if it raises, and always
+        returns the connection to the pool.
+        """
+        session = self._session_factory()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _apply_pragmas(self, dbapi_connection, connection_record):
+        """Connection-event hook that applies the performance profile"""
+        cursor = dbapi_connection.cursor()
+        for name, value in self.pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
 
     def add_member_counts(self, counts: Dict[str, int], timestamp: Optional[datetime] = None):
         """
@@ -60,76 +388,604 @@ class MemberDatabase:
         if timestamp is None:
             timestamp = datetime.now()
 
-        for group_name, count in counts.items():
-            if count is not None:  # Skip failed scrapes
-                record = MemberCount(
-                    timestamp=timestamp,
-                    group_name=group_name,
-                    member_count=count
-                )
-                self.session.add(record)
+        stored = sum(1 for count in counts.values() if count is not None)
+        if stored == len(counts):
+            status = RUN_COMPLETE
+        else:
+            status = RUN_PARTIAL if stored else RUN_FAILED
+
+        with self.session_scope() as session:
+            conn = session.connection()
+            latest = conn.execute(select(func.max(MemberCount.timestamp))).scalar()
+            group_ids = self._group_ids(conn, (name for name, count in counts.items() if count is not None))
+            stored_counts = {}
+            for group_name, count in counts.items():
+                if count is not None:  # Skip failed scrapes
+                    record = MemberCount(
+                        timestamp=timestamp,
+                        group_id=group_ids[group_name],
+                        member_count=count
+                    )
+                    session.add(record)
+                    stored_counts[group_ids[group_name]] = count
+
+            # Same transaction, so the run and totals never disagree with the raw rows
+            session.flush()
+            self._record_runs(conn, [timestamp], status)
+            self._refresh_totals(conn, [timestamp])
+            if latest is None or timestamp > latest:
+                self._append_rollups(conn, timestamp, stored_counts)
+            else:
+                # Backfilled or repeated collection: later buckets may depend on it
+                self._refresh_rollups(conn, [timestamp])
+
+        self.query_cache.bump()
+
+    @staticmethod
+    def _iter_rows(rows: Union[pd.DataFrame, Iterable[Tuple[datetime, str, int]]]) -> Iterator[dict]:
+        """Normalise bulk input into insert parameter dicts, skipping failed scrapes"""
+        if isinstance(rows, pd.DataFrame):
+            if {'timestamp', 'group_name', 'member_count'}.issubset(rows.columns):
+                rows = rows[['timestamp', 'group_name', 'member_count']]
+            rows = rows.itertuples(index=False, name=None)
+
+        for timestamp, group_name, count in rows:
+            if count is None or count != count:  # None or NaN
+                continue
+            if isinstance(timestamp, pd.Timestamp):
+                timestamp = timestamp.to_pydatetime()
+            yield {'timestamp': timestamp, 'group_name': group_name, 'member_count': int(count)}
+
+    def add_member_counts_bulk(self, rows: Union[pd.DataFrame, Iterable[Tuple[datetime, str, int]]],
+                               chunk_size: int = 50000, atomic: bool = True) -> int:
+        """
+        Bulk-insert (timestamp, group_name, member_count) rows
+
+        Rows are written with Core executemany in chunks of chunk_size, so memory
+        stays flat no matter how many rows are passed. Use this for backfills;
+        add_member_counts is fine for a single collection.
+
+        Args:
+            rows: DataFrame with timestamp/group_name/member_count columns, or
+                an iterable of (timestamp, group_name, member_count) tuples
+            chunk_size: Rows per executemany batch
+            atomic: If True, all chunks share one transaction; if False, each
+                chunk is committed as it is written
+
+        Returns:
+            Number of rows inserted
+        """
+        insert = MemberCount.__table__.insert()
+        params = self._iter_rows(rows)
+        inserted = 0
+
+        def chunks():
+            while True:
+                chunk = list(islice(params, chunk_size))
+                if not chunk:
+                    return
+                yield chunk
+
+        def write(conn, chunk):
+            group_ids = self._group_ids(conn, (row['group_name'] for row in chunk))
+            for row in chunk:
+                row['group_id'] = group_ids[row.pop('group_name')]
+            conn.execute(insert, chunk)
+
+        try:
+            if atomic:
+                with self.engine.begin() as conn:
+                    timestamps = set()
+                    for chunk in chunks():
+                        write(conn, chunk)
+                        timestamps.update(row['timestamp'] for row in chunk)
+                        inserted += len(chunk)
+                    self._record_runs(conn, timestamps)
+                    self._refresh_totals(conn, timestamps)
+                    self._refresh_rollups(conn, timestamps)
+            else:
+                for chunk in chunks():
+                    with self.engine.begin() as conn:
+                        write(conn, chunk)
+                        timestamps = {row['timestamp'] for row in chunk}
+                        self._record_runs(conn, timestamps)
+                        self._refresh_totals(conn, timestamps)
+                        self._refresh_rollups(conn, timestamps)
+                    inserted += len(chunk)
+        finally:
+            # Non-atomic chunks stay committed even if a later one fails
+            self.query_cache.bump()
+
+        return inserted
+
+    @staticmethod
+    def _record_runs(conn, timestamps: Iterable[datetime], status: Optional[str] = None):
+        """
+        Make sure a collection run exists for each timestamp
+
+        Args:
+            conn: Connection inside the transaction that wrote the counts
+            timestamps: Run start times
+            status: Status to set; None leaves existing runs alone and marks
+                new ones complete (bulk backfills carry no failure information)
+        """
+        rows = [{'started_at': ts, 'status': status or RUN_COMPLETE} for ts in sorted(set(timestamps))]
+        if not rows:
+            return
+
+        insert = sqlite_insert(CollectionRun.__table__)
+        if status is None:
+            insert = insert.on_conflict_do_nothing(index_elements=['started_at'])
+        else:
+            insert = insert.on_conflict_do_update(index_elements=['started_at'], set_={'status': status})
+        conn.execute(insert, rows)
+
+    @staticmethod
+    def _backfill_runs(conn):
+        """Create a run for every distinct timestamp already in member_counts, oldest first"""
+        timestamps = select(MemberCount.timestamp, literal(RUN_COMPLETE)).distinct().order_by(MemberCount.timestamp)
+        conn.execute(CollectionRun.__table__.insert().from_select(['started_at', 'status'], timestamps))
+
+    def _refresh_totals(self, conn, timestamps: Iterable[datetime]):
+        """
+        Recompute the collection and region totals for some collections
+
+        Args:
+            conn: Connection inside the transaction that changed member_counts
+            timestamps: Collections whose rows were added or changed
+        """
+        counts = MemberCount.__table__
+        groups = Group.__table__
+        collection_totals = CollectionTotal.__table__
+        region_totals = RegionTotal.__table__
+        timestamps = sorted(set(timestamps))
+
+        for start in range(0, len(timestamps), TOTALS_BATCH_SIZE):
+            batch = timestamps[start:start + TOTALS_BATCH_SIZE]
+
+            totals: Dict[datetime, List[int]] = {}
+            by_region: Dict[Tuple[datetime, str], List[int]] = {}
+            rows = conn.execute(
+                select(counts.c.timestamp, groups.c.name, counts.c.member_count)
+                .join(groups, groups.c.id == counts.c.group_id)
+                .where(counts.c.timestamp.in_(batch))
+            )
+            for timestamp, group_name, count in rows:
+                region = self.registry.region_of(group_name) or UNASSIGNED_REGION
+                for key, target in ((timestamp, totals), ((timestamp, region), by_region)):
+                    entry = target.setdefault(key, [0, 0])
+                    entry[0] += count
+                    entry[1] += 1
+
+            conn.execute(delete(collection_totals).where(collection_totals.c.timestamp.in_(batch)))
+            conn.execute(delete(region_totals).where(region_totals.c.timestamp.in_(batch)))
+            if totals:
+                conn.execute(collection_totals.insert(), [
+                    {'timestamp': ts, 'total_members': total, 'group_count': n}
+                    for ts, (total, n) in totals.items()
+                ])
+                conn.execute(region_totals.insert(), [
+                    {'timestamp': ts, 'region': region, 'total_members': total, 'group_count': n}
+                    for (ts, region), (total, n) in by_region.items()
+                ])
+
+    @staticmethod
+    def _append_rollups(conn, timestamp: datetime, counts: Dict[int, int]):
+        """
+        Fold a collection newer than every stored one into the rollups
+
+        One upsert per period and group: a new bucket starts with this count
+        (its delta taken against the previous bucket's last count, if the
+        group has one), an existing bucket gets it as its new last count.
+        Nothing later can depend on the collection, so no other bucket changes.
+
+        Args:
+            conn: Connection inside the transaction that added the counts
+            timestamp: The collection's time (later than any other in member_counts)
+            counts: Group id -> count stored by the collection
+        """
+        if not counts:
+            return
+        params = []
+        for period in ROLLUP_PERIODS:
+            start = _bucket_start(timestamp, period)
+            bucket = {
+                'period': period,
+                'bucket_start': start,
+                'previous_start': _step_bucket(pd.Timestamp(start), period, -1).to_pydatetime(),
+                'timestamp': timestamp,
+            }
+            params.extend({**bucket, 'group_id': group_id, 'count': count} for group_id, count in counts.items())
+        conn.execute(_APPEND_ROLLUP, params)
+
+    @staticmethod
+    def _refresh_rollups(conn, timestamps: Iterable[datetime]):
+        """
+        Recompute the day, week and month rollups touched by some collections
+
+        Day buckets are rebuilt from the raw rows of the touched days only;
+        week and month buckets are then rebuilt from those days' rollups, so a
+        collection reads one day of member_counts rather than a month or more.
+
+        Args:
+            conn: Connection inside the transaction that changed member_counts
+            timestamps: Collections whose rows were added or changed
+        """
+        timestamps = pd.Series(pd.to_datetime(sorted(set(timestamps))), dtype='datetime64[ns]')
+        if timestamps.empty:
+            return
+        days = bucket_starts(timestamps, 'day').drop_duplicates()
+
+        counts = MemberCount.__table__
+        rows = pd.read_sql(
+            select(counts.c.timestamp, counts.c.group_id, counts.c.member_count)
+            .where(counts.c.timestamp >= days.iloc[0].to_pydatetime(),
+                   counts.c.timestamp < _step_bucket(days.iloc[-1], 'day', 1).to_pydatetime())
+            .order_by(counts.c.timestamp),
+            conn,
+        )
+        rows['timestamp'] = pd.to_datetime(rows['timestamp'])
+        rows = rows[bucket_starts(rows['timestamp'], 'day').isin(days)]
+        day_buckets = rows.assign(bucket_start=bucket_starts(rows['timestamp'], 'day')).groupby(
+            ['group_id', 'bucket_start'], sort=True
+        ).agg(
+            first_count=('member_count', 'first'),
+            last_count=('member_count', 'last'),
+            min_count=('member_count', 'min'),
+            max_count=('member_count', 'max'),
+            samples=('member_count', 'size'),
+            last_timestamp=('timestamp', 'max'),
+        ).reset_index()
+        MemberDatabase._write_rollups(conn, 'day', days, day_buckets)
+
+        for period in ROLLUP_PERIODS[1:]:
+            touched = bucket_starts(days, period).drop_duplicates()
+            in_days = MemberDatabase._read_rollups(
+                conn, 'day', touched.iloc[0], _step_bucket(touched.iloc[-1], period, 1)
+            )
+            in_days = in_days[bucket_starts(in_days['bucket_start'], period).isin(touched)]
+            buckets = in_days.assign(bucket_start=bucket_starts(in_days['bucket_start'], period)).groupby(
+                ['group_id', 'bucket_start'], sort=True
+            ).agg(
+                first_count=('first_count', 'first'),
+                last_count=('last_count', 'last'),
+                min_count=('min_count', 'min'),
+                max_count=('max_count', 'max'),
+                samples=('samples', 'sum'),
+                last_timestamp=('last_timestamp', 'max'),
+            ).reset_index()
+            MemberDatabase._write_rollups(conn, period, touched, buckets)
+
+    @staticmethod
+    def _read_rollups(conn, period: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """Stored rollups of one period with start <= bucket_start < end, in group then time order"""
+        rollups = GroupRollup.__table__
+        df = pd.read_sql(
+            select(rollups.c.group_id, rollups.c.bucket_start, rollups.c.first_count, rollups.c.last_count,
+                   rollups.c.min_count, rollups.c.max_count, rollups.c.samples, rollups.c.last_timestamp)
+            .where(rollups.c.period == period,
+                   rollups.c.bucket_start >= start.to_pydatetime(),
+                   rollups.c.bucket_start < end.to_pydatetime())
+            .order_by(rollups.c.group_id, rollups.c.bucket_start),
+            conn,
+        )
+        df['bucket_start'] = pd.to_datetime(df['bucket_start'])
+        df['last_timestamp'] = pd.to_datetime(df['last_timestamp'])
+        return df
+
+    @staticmethod
+    def _write_rollups(conn, period: str, touched: pd.Series, buckets: pd.DataFrame):
+        """
+        Replace the rollups of some buckets and fix up the deltas next to them
+
+        Args:
+            conn: Connection inside the transaction
+            period: One of ROLLUP_PERIODS
+            touched: Start of every bucket being replaced (sorted, unique)
+            buckets: Their new aggregates (no delta), possibly missing some groups
+        """
+        # The bucket before each touched one is read for deltas; the one after
+        # is rewritten, since its delta depends on the touched bucket's last count
+        before = set(touched.map(lambda start: _step_bucket(start, period, -1))) - set(touched)
+        after = set(touched.map(lambda start: _step_bucket(start, period, 1))) - set(touched)
+        neighbours = MemberDatabase._read_rollups(
+            conn, period, min(before | set(touched)), max(after | set(touched)) + pd.Timedelta(days=1)
+        )
+        neighbours = neighbours[neighbours['bucket_start'].isin(before | after)]
+
+        combined = pd.concat([buckets, neighbours], ignore_index=True).sort_values(
+            ['group_id', 'bucket_start'], kind='stable', ignore_index=True
+        )
+        # Change since the previous bucket's last count, or within the
+        # bucket when the group has no count in the previous one
+        index = _bucket_index(combined['bucket_start'], period)
+        by_group = combined.groupby('group_id')
+        follows = index - index.groupby(combined['group_id']).shift() == 1
+        prev_last = by_group['last_count'].shift()
+        combined['delta'] = combined['last_count'] - prev_last.where(follows, combined['first_count'])
+
+        rewritten = sorted(set(touched) | after)
+        combined = combined[combined['bucket_start'].isin(rewritten)]
 
-        self.session.commit()
+        rollups = GroupRollup.__table__
+        for start in range(0, len(rewritten), TOTALS_BATCH_SIZE):
+            batch = [bucket.to_pydatetime() for bucket in rewritten[start:start + TOTALS_BATCH_SIZE]]
+            conn.execute(delete(rollups).where(rollups.c.period == period, rollups.c.bucket_start.in_(batch)))
+        if combined.empty:
+            return
+        conn.execute(rollups.insert(), [
+            {
+                'period': period,
+                'bucket_start': row.bucket_start.to_pydatetime(),
+                'group_id': int(row.group_id),
+                'first_count': int(row.first_count),
+                'last_count': int(row.last_count),
+                'min_count': int(row.min_count),
+                'max_count': int(row.max_count),
+                'delta': int(row.delta),
+                'samples': int(row.samples),
+                'last_timestamp': row.last_timestamp.to_pydatetime(),
+            }
+            for row in combined.itertuples(index=False)
+        ])
 
-    def get_all_data(self) -> pd.DataFrame:
+    def rebuild_totals(self) -> int:
         """
-        Get all member count data
+        Recompute the totals and rollup tables from member_counts
+
+        Needed once for databases written before those tables existed, or
+        after editing member_counts by hand.
+
+        Returns:
+            Number of collections summarised
+        """
+        with self.engine.begin() as conn:
+            conn.execute(delete(CollectionTotal.__table__))
+            conn.execute(delete(RegionTotal.__table__))
+            conn.execute(delete(GroupRollup.__table__))
+            timestamps = [row[0] for row in conn.execute(select(MemberCount.timestamp).distinct())]
+            self._refresh_totals(conn, timestamps)
+            self._refresh_rollups(conn, timestamps)
+
+        self.query_cache.bump()
+        return len(timestamps)
+
+    @staticmethod
+    def _in_range(query, column, start: Optional[datetime], end: Optional[datetime]):
+        """Restrict a query to start <= column <= end (either bound may be None)"""
+        if start is not None:
+            query = query.where(column >= start)
+        if end is not None:
+            query = query.where(column <= end)
+        return query
+
+    @staticmethod
+    def _ids_of(names: Iterable[str]):
+        """Subquery of the ids of some group names, for filtering on group_id"""
+        return select(Group.id).where(Group.name.in_(list(names)))
+
+    @cached_query
+    def get_all_data(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                     groups: Optional[Iterable[str]] = None, resolution: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get member count data, optionally limited to a time window and groups
+
+        The filters run in SQLite (on idx_group_timestamp when groups are
+        given), so only the rows in the window are loaded.
+
+        Args:
+            start: Earliest timestamp to include (None = from the beginning)
+            end: Latest timestamp to include (None = up to now)
+            groups: Group names to include (None = all groups)
+            resolution: None for every collection, a ROLLUP_PERIODS entry for
+                each group's last count per bucket, or 'auto' to let
+                choose_rollup decide
 
         Returns:
             DataFrame with columns: timestamp, group_name, member_count
         """
-        query = self.session.query(MemberCount).order_by(MemberCount.timestamp)
-        return pd.read_sql(query.statement, self.engine)
+        period = self._resolve_rollup(resolution, start, end)
+        if period is not None:
+            rollup = self.get_rollup(period, start, end, groups)
+            return pd.DataFrame({
+                'timestamp': rollup['last_timestamp'],
+                'group_name': rollup['group_name'],
+                'member_count': rollup['last_count'],
+            }).sort_values('timestamp', kind='stable', ignore_index=True)
 
-    def get_group_data(self, group_name: str) -> pd.DataFrame:
+        query = select(
+            MemberCount.id,
+            MemberCount.timestamp,
+            Group.name.label('group_name'),
+            MemberCount.member_count
+        ).join(
+            Group, Group.id == MemberCount.group_id
+        ).order_by(MemberCount.timestamp, MemberCount.id)
+        query = self._in_range(query, MemberCount.timestamp, start, end)
+        if groups is not None:
+            query = query.where(MemberCount.group_id.in_(self._ids_of(groups)))
+        return pd.read_sql(query, self.engine)
+
+    @cached_query
+    def get_group_data(self, group_name: str, start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> pd.DataFrame:
         """
         Get data for a specific group
 
         Args:
             group_name: Name of the group
+            start: Earliest timestamp to include (None = from the beginning)
+            end: Latest timestamp to include (None = up to now)
 
         Returns:
             DataFrame with columns: timestamp, member_count
         """
-        query = self.session.query(
+        query = select(
             MemberCount.timestamp,
             MemberCount.member_count
-        ).filter(
-            MemberCount.group_name == group_name
+        ).where(
+            MemberCount.group_id == select(Group.id).where(Group.name == group_name).scalar_subquery()
         ).order_by(MemberCount.timestamp)
+        query = self._in_range(query, MemberCount.timestamp, start, end)
 
-        df = pd.read_sql(query.statement, self.engine)
+        df = pd.read_sql(query, self.engine)
         return df
 
-    def get_latest_counts(self) -> Dict[str, Tuple[int, datetime]]:
+    @cached_query
+    def get_runs(self, include_failed: bool = False) -> pd.DataFrame:
         """
-        Get the most recent member count for each group
+        Get collection runs, newest first
+
+        Args:
+            include_failed: Also return runs that stored no counts
 
         Returns:
-            Dictionary mapping group names to (count, timestamp) tuples
+            DataFrame with columns: id, started_at, status
         """
-        # Get latest timestamp
-        latest_query = self.session.query(MemberCount.timestamp).order_by(
-            MemberCount.timestamp.desc()
-        ).limit(1)
+        query = select(
+            CollectionRun.id,
+            CollectionRun.started_at,
+            CollectionRun.status
+        ).order_by(CollectionRun.started_at.desc())
+        if not include_failed:
+            query = query.where(CollectionRun.status != RUN_FAILED)
 
-        latest_time = latest_query.first()
-        if not latest_time:
-            return {}
+        df = pd.read_sql(query, self.engine)
+        df['started_at'] = pd.to_datetime(df['started_at'])
+        return df
 
-        latest_time = latest_time[0]
+    @cached_query
+    def get_latest_run_id(self) -> Optional[int]:
+        """
+        Get the id of the most recent collection run that stored counts
 
-        # Get all counts from that timestamp
-        query = self.session.query(MemberCount).filter(
-            MemberCount.timestamp == latest_time
-        )
+        Returns:
+            Run id, or None if nothing has been collected
+        """
+        query = select(CollectionRun.id).where(
+            CollectionRun.status != RUN_FAILED
+        ).order_by(CollectionRun.started_at.desc()).limit(1)
 
-        results = {}
-        for record in query:
-            results[record.group_name] = (record.member_count, record.timestamp)
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar()
 
-        return results
+    @staticmethod
+    def _run_rows():
+        """Counts joined to the run they belong to, in run then group order"""
+        return select(
+            CollectionRun.id.label('run_id'),
+            MemberCount.timestamp,
+            Group.name.label('group_name'),
+            MemberCount.member_count
+        ).join(
+            MemberCount, MemberCount.timestamp == CollectionRun.started_at
+        ).join(
+            Group, Group.id == MemberCount.group_id
+        ).order_by(CollectionRun.started_at, Group.name)
 
+    def _read_run_rows(self, query) -> pd.DataFrame:
+        """Run a _run_rows query into a DataFrame"""
+        df = pd.read_sql(query, self.engine)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df
+
+    @cached_query
+    def get_snapshots(self, run_ids: Iterable[int]) -> pd.DataFrame:
+        """
+        Get the member counts of several collection runs in one query
+
+        Args:
+            run_ids: Collection run ids
+
+        Returns:
+            DataFrame with columns: run_id, timestamp, group_name, member_count
+        """
+        return self._read_run_rows(self._run_rows().where(CollectionRun.id.in_(list(run_ids))))
+
+    @cached_query
+    def get_runs_after(self, run_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get the member counts of every run with a higher id than the given one
+
+        Lets a caller that already holds runs up to run_id fetch just the new
+        ones; the filter is a range scan on the runs primary key.
+
+        Args:
+            run_id: Last run id already held (None = every run)
+
+        Returns:
+            DataFrame with columns: run_id, timestamp, group_name, member_count
+        """
+        query = self._run_rows()
+        if run_id is not None:
+            query = query.where(CollectionRun.id > run_id)
+        return self._read_run_rows(query)
+
+    @cached_query
+    def get_rows_since(self, timestamp: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Get the member counts collected after a timestamp
+
+        Args:
+            timestamp: Latest collection time already held (None = everything)
+
+        Returns:
+            DataFrame with columns: run_id, timestamp, group_name, member_count
+        """
+        query = self._run_rows()
+        if timestamp is not None:
+            query = query.where(CollectionRun.started_at > timestamp)
+        return self._read_run_rows(query)
+
+    @cached_query
+    def get_run_count(self, through_run_id: Optional[int] = None) -> int:
+        """
+        Get the number of collection runs that stored counts
+
+        Counts the runs get_runs_after returns (those with at least one member
+        count), so a caller holding them can check it is still in sync.
+
+        Args:
+            through_run_id: Only count runs with an id up to this one (None = all)
+
+        Returns:
+            Number of runs
+        """
+        has_counts = select(MemberCount.id).where(MemberCount.timestamp == CollectionRun.started_at).exists()
+        query = select(func.count()).select_from(CollectionRun).where(has_counts)
+        if through_run_id is not None:
+            query = query.where(CollectionRun.id <= through_run_id)
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar()
+
+    @staticmethod
+    def _counts_at(started_at):
+        """Counts of the run whose start time is given by a scalar subquery"""
+        return select(
+            Group.name,
+            MemberCount.member_count,
+            MemberCount.timestamp
+        ).join(
+            Group, Group.id == MemberCount.group_id
+        ).where(MemberCount.timestamp == started_at)
+
+    @cached_query
+    def get_latest_counts(self) -> Dict[str, Tuple[int, datetime]]:
+        """
+        Get the most recent member count for each group
+
+        Returns:
+            Dictionary mapping group names to (count, timestamp) tuples
+        """
+        latest = select(func.max(CollectionRun.started_at)).where(
+            CollectionRun.status != RUN_FAILED
+        ).scalar_subquery()
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(self._counts_at(latest))
+            return {group_name: (count, timestamp) for group_name, count, timestamp in rows}
+
+    @cached_query
     def get_previous_counts(self, before_timestamp: datetime) -> Dict[str, int]:
         """
         Get member counts from the collection period before the given timestamp
@@ -140,45 +996,198 @@ class MemberDatabase:
         Returns:
             Dictionary mapping group names to member counts
         """
-        # Get the most recent timestamp before the given one
-        prev_query = self.session.query(MemberCount.timestamp).filter(
-            MemberCount.timestamp < before_timestamp
-        ).order_by(MemberCount.timestamp.desc()).limit(1)
+        previous = select(func.max(CollectionRun.started_at)).where(
+            CollectionRun.started_at < before_timestamp,
+            CollectionRun.status != RUN_FAILED
+        ).scalar_subquery()
 
-        prev_time = prev_query.first()
-        if not prev_time:
-            return {}
+        with self.engine.connect() as conn:
+            rows = conn.execute(self._counts_at(previous))
+            return {group_name: count for group_name, count, _ in rows}
 
-        prev_time = prev_time[0]
+    @cached_query
+    def get_aggregated_totals(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                              resolution: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get aggregated total member counts over time
+
+        Reads the precomputed collection_totals table rather than summing
+        member_counts on every call, or a rollup table when a resolution is
+        given, so long ranges return one row per bucket.
+
+        Args:
+            start: Earliest timestamp to include (None = from the beginning)
+            end: Latest timestamp to include (None = up to now)
+            resolution: None for every collection, a ROLLUP_PERIODS entry for
+                one point per bucket (each group's last count, summed), or
+                'auto' to let choose_rollup decide
 
-        # Get all counts from that timestamp
-        query = self.session.query(MemberCount).filter(
-            MemberCount.timestamp == prev_time
+        Returns:
+            DataFrame with columns: timestamp, total_members
+        """
+        period = self._resolve_rollup(resolution, start, end)
+        if period is not None:
+            query = select(
+                func.max(GroupRollup.last_timestamp).label('timestamp'),
+                func.sum(GroupRollup.last_count).label('total_members')
+            ).where(
+                GroupRollup.period == period
+            ).group_by(GroupRollup.bucket_start).order_by(GroupRollup.bucket_start)
+            query = self._in_range(query, GroupRollup.last_timestamp, start, end)
+
+            df = pd.read_sql(query, self.engine)
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            return df
+
+        query = select(
+            CollectionTotal.timestamp,
+            CollectionTotal.total_members
+        ).order_by(CollectionTotal.timestamp)
+        query = self._in_range(query, CollectionTotal.timestamp, start, end)
+
+        df = pd.read_sql(query, self.engine)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df
+
+    @cached_query
+    def _collection_span(self) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """First and last collection that stored counts (None, None if there are none)"""
+        query = select(func.min(CollectionRun.started_at), func.max(CollectionRun.started_at)).where(
+            CollectionRun.status != RUN_FAILED
         )
+        with self.engine.connect() as conn:
+            return tuple(conn.execute(query).one())
+
+    def choose_rollup(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                      min_points: int = ROLLUP_MIN_POINTS) -> Optional[str]:
+        """
+        Pick the coarsest rollup period that still resolves a time range
+
+        Args:
+            start: Earliest time of the range (None = the first collection)
+            end: Latest time of the range (None = the last collection)
+            min_points: Fewest buckets the range must span for a period to be used
+
+        Returns:
+            A ROLLUP_PERIODS entry, or None if the range is too short for any
+            rollup and raw collections should be read
+        """
+        first, last = self._collection_span()
+        if first is None:
+            return None
+        start = max(start, first) if start is not None else first
+        end = min(end, last) if end is not None else last
+        span_days = (end - start).total_seconds() / 86400
 
-        results = {}
-        for record in query:
-            results[record.group_name] = record.member_count
+        for period in reversed(ROLLUP_PERIODS):
+            if span_days / ROLLUP_PERIOD_DAYS[period] >= min_points:
+                return period
+        return None
 
-        return results
+    def _resolve_rollup(self, resolution: Optional[str], start: Optional[datetime],
+                        end: Optional[datetime]) -> Optional[str]:
+        """Rollup period for a resolution argument: None (raw), 'auto' or a period name"""
+        if resolution == 'auto':
+            return self.choose_rollup(start, end)
+        if resolution is not None and resolution not in ROLLUP_PERIODS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        return resolution
 
-    def get_aggregated_totals(self) -> pd.DataFrame:
+    @cached_query
+    def get_rollup(self, period: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   groups: Optional[Iterable[str]] = None) -> pd.DataFrame:
         """
-        Get aggregated total member counts over time
+        Get per-group rollups for one period
+
+        Args:
+            period: One of ROLLUP_PERIODS
+            start: Earliest time to include (None = from the beginning); a
+                bucket is included if its last collection is in the range
+            end: Latest time to include (None = up to now)
+            groups: Group names to include (None = all groups)
 
         Returns:
-            DataFrame with columns: timestamp, total_members
+            DataFrame with columns: bucket_start, group_name, first_count,
+            last_count, min_count, max_count, delta, samples, last_timestamp.
+            delta is the change since the previous bucket's last count (or
+            since the bucket's first count if the group has none there).
         """
-        query = """
-        SELECT timestamp, SUM(member_count) as total_members
-        FROM member_counts
-        GROUP BY timestamp
-        ORDER BY timestamp
+        if period not in ROLLUP_PERIODS:
+            raise ValueError(f"Unknown rollup period: {period}")
+
+        query = select(
+            GroupRollup.bucket_start,
+            Group.name.label('group_name'),
+            GroupRollup.first_count,
+            GroupRollup.last_count,
+            GroupRollup.min_count,
+            GroupRollup.max_count,
+            GroupRollup.delta,
+            GroupRollup.samples,
+            GroupRollup.last_timestamp
+        ).join(
+            Group, Group.id == GroupRollup.group_id
+        ).where(GroupRollup.period == period).order_by(GroupRollup.bucket_start, Group.name)
+        query = self._in_range(query, GroupRollup.last_timestamp, start, end)
+        if groups is not None:
+            query = query.where(GroupRollup.group_id.in_(self._ids_of(groups)))
+
+        df = pd.read_sql(query, self.engine)
+        df['bucket_start'] = pd.to_datetime(df['bucket_start'])
+        df['last_timestamp'] = pd.to_datetime(df['last_timestamp'])
+        return df
+
+    @cached_query
+    def get_daily_runs(self) -> pd.DataFrame:
         """
+        Get the latest run of each day that stored counts, newest first
+
+        Read from the daily rollups, whose last_timestamp is that run's start.
+
+        Returns:
+            DataFrame with columns: id, started_at, status
+        """
+        latest = select(func.max(GroupRollup.last_timestamp)).where(
+            GroupRollup.period == 'day'
+        ).group_by(GroupRollup.bucket_start)
+        query = select(
+            CollectionRun.id,
+            CollectionRun.started_at,
+            CollectionRun.status
+        ).where(
+            CollectionRun.started_at.in_(latest)
+        ).order_by(CollectionRun.started_at.desc())
+
+        df = pd.read_sql(query, self.engine)
+        df['started_at'] = pd.to_datetime(df['started_at'])
+        return df
+
+    @cached_query
+    def get_region_totals(self, start: Optional[datetime] = None,
+                          end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Get total member counts per region over time
+
+        Args:
+            start: Earliest timestamp to include (None = from the beginning)
+            end: Latest timestamp to include (None = up to now)
+
+        Returns:
+            DataFrame with columns: timestamp, region, total_members, group_count
+        """
+        query = select(
+            RegionTotal.timestamp,
+            RegionTotal.region,
+            RegionTotal.total_members,
+            RegionTotal.group_count
+        ).order_by(RegionTotal.timestamp, RegionTotal.region)
+        query = self._in_range(query, RegionTotal.timestamp, start, end)
+
         df = pd.read_sql(query, self.engine)
         df['timestamp'] = pd.to_datetime(df['timestamp'])
         return df
 
+    @cached_query
     def get_all_groups(self) -> List[str]:
         """
         Get list of all group names in database
@@ -186,17 +1195,58 @@ class MemberDatabase:
         Returns:
             List of group names
         """
-        query = self.session.query(MemberCount.group_name).distinct()
-        return [row[0] for row in query]
+        with self.session_scope() as session:
+            # Only names that still have counts (idx_group_timestamp answers each check)
+            has_counts = session.query(MemberCount.id).filter(MemberCount.group_id == Group.id).exists()
+            query = session.query(Group.name).filter(has_counts).order_by(Group.name)
+            return [row[0] for row in query]
 
     def clear_all_data(self):
         """Clear all data from database (use with caution!)"""
-        self.session.query(MemberCount).delete()
-        self.session.commit()
+        with self.session_scope() as session:
+            session.query(MemberCount).delete()
+            session.query(CollectionRun).delete()
+            session.query(CollectionTotal).delete()
+            session.query(RegionTotal).delete()
+            session.query(GroupRollup).delete()
+            session.query(Group).delete()
+
+        self.query_cache.bump()
+
+    def _file_data_version(self) -> int:
+        """SQLite's data_version for the file: changes whenever another connection commits"""
+        with self._version_lock:
+            return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def data_version(self) -> int:
+        """
+        Version of the stored data, for keying views derived from it
+
+        Checked against the file on every call, so it also moves when another
+        process (the scheduled collector) commits.
+
+        Returns:
+            A number that changes whenever the data may have changed
+        """
+        return self.query_cache.validate()
+
+    def invalidate_cache(self):
+        """Drop cached reads (other writers are detected automatically; this forces it)"""
+        self.query_cache.bump()
 
     def close(self):
         """Close database connection"""
-        self.session.close()
+        self._scoped_session.remove()
+        with self._version_lock:
+            self._version_conn.close()
+
+        if str(self.pragmas.get('journal_mode', '')).upper() == 'WAL':
+            # Fold the write-ahead log back into the main file so data/members.db
+            # is complete on its own (it is committed to git)
+            with self.engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        self.engine.dispose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,156 @@
+"""
+On-disk HTTP response cache with TTL and conditional-request revalidation
+"""
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'conflux-tracker' / 'http_cache.db'
+
+# Counts barely move within a quarter of an hour, so repeat collections reuse them
+DEFAULT_TTL = 15 * 60
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body and the validators needed to revalidate it"""
+    url: str
+    body: bytes
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the body was fetched or last revalidated"""
+        return time.time() - self.fetched_at
+
+
+class HttpCache:
+    """
+    SQLite-backed response cache
+
+    Entries younger than the TTL are served without touching the network.
+    Older entries are revalidated with If-None-Match / If-Modified-Since, so
+    an unchanged page costs a 304 instead of a full download.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file holding cached responses
+            ttl: Seconds a response is served without revalidation
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                fetched_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )
+        """)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Get the cached entry for a URL, fresh or not"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, body, fetched_at, etag, last_modified FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+        return CacheEntry(*row) if row else None
+
+    def is_fresh(self, entry: CacheEntry, max_age: Optional[float] = None) -> bool:
+        """
+        Check whether an entry can be served without asking the server
+
+        Args:
+            entry: Cached entry
+            max_age: Override for the cache TTL in seconds
+        """
+        limit = self.ttl if max_age is None else max_age
+        return entry.age < limit
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """Build revalidation headers from an entry's validators"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url: str, body: bytes, headers: Mapping[str, str]) -> CacheEntry:
+        """
+        Save a response (callers only store pages a count was parsed from)
+
+        Args:
+            url: Request URL
+            body: Response body
+            headers: Response headers (ETag and Last-Modified are kept)
+        """
+        entry = CacheEntry(
+            url=url,
+            body=body,
+            fetched_at=time.time(),
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified'),
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, body, fetched_at, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (entry.url, entry.body, entry.fetched_at, entry.etag, entry.last_modified)
+            )
+            self._conn.commit()
+        return entry
+
+    def touch(self, entry: CacheEntry) -> CacheEntry:
+        """Mark an entry as revalidated (server answered 304 Not Modified)"""
+        entry.fetched_at = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ? WHERE url = ?",
+                (entry.fetched_at, entry.url)
+            )
+            self._conn.commit()
+        return entry
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        """Close the cache file"""
+        with self._lock:
+            self._conn.close()
+
+
+_default_caches: Dict[Path, HttpCache] = {}
+_default_caches_lock = threading.Lock()
+
+
+def get_http_cache(path: Path = DEFAULT_CACHE_PATH) -> HttpCache:
+    """Get the process-wide cache for a file, so every scraper shares one connection"""
+    with _default_caches_lock:
+        cache = _default_caches.get(Path(path))
+        if cache is None:
+            cache = HttpCache(path)
+            _default_caches[Path(path)] = cache
+        return cache
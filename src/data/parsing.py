@@ -0,0 +1,91 @@
+"""
+Lightweight member-count extraction from scraped pages
+"""
+import re
+from typing import Optional, Union
+
+# Telegram renders the count inside <div class="tgme_page_extra">...</div>
+_PAGE_EXTRA_MARKER = b'tgme_page_extra'
+
+# One pattern covers "14 760 members", "1,234 subscribers" and "1.2K members":
+# the number (with any separators) and the optional K/M suffix come out of a single scan
+_COUNT_PATTERN = re.compile(
+    r'(\d[\d.,\u00a0\u202f ]*)([KM]?)\s+(?:members|subscribers)\b',
+    re.IGNORECASE,
+)
+_SEPARATORS = re.compile(r'[,\u00a0\u202f ]')
+_MULTIPLIERS = {'k': 1000, 'm': 1000000}
+
+
+def parse_member_count(text: str) -> Optional[int]:
+    """
+    Find the first member/subscriber count in a piece of text
+
+    Handles "14 760 members", "1,234 Members", "1.2K subscribers" and "1.5M members".
+
+    Args:
+        text: Text to search
+
+    Returns:
+        Member count or None if no count was found
+    """
+    match = _COUNT_PATTERN.search(text)
+    if not match:
+        return None
+
+    number, suffix = match.groups()
+    number = _SEPARATORS.sub('', number)
+    if suffix:
+        # Convert "1.2K" to 1200, "1.5M" to 1500000
+        return round(float(number) * _MULTIPLIERS[suffix.lower()])
+    # Without a suffix a dot can only be a thousands separator ("1.234 members")
+    return int(number.replace('.', ''))
+
+
+def find_page_extra(raw: bytes) -> Optional[bytes]:
+    """
+    Slice the inner contents of the tgme_page_extra element out of raw HTML
+
+    Args:
+        raw: Undecoded page body
+
+    Returns:
+        Element contents, or None if the element is not present
+    """
+    start = raw.find(_PAGE_EXTRA_MARKER)
+    if start == -1:
+        return None
+
+    start = raw.find(b'>', start)
+    if start == -1:
+        return None
+
+    end = raw.find(b'</div>', start)
+    if end == -1:
+        return None
+
+    return raw[start + 1:end]
+
+
+def extract_telegram_count(page: Union[str, bytes]) -> Optional[int]:
+    """
+    Fast path: read the member count from the tgme_page_extra element only
+
+    No DOM is built; the element is located with a byte search and a single
+    regex runs over its (very short) contents.
+
+    Args:
+        page: Page HTML as bytes or text
+
+    Returns:
+        Member count or None if the fast path could not find one
+    """
+    raw = page.encode('utf-8') if isinstance(page, str) else page
+
+    extra = find_page_extra(raw)
+    if extra is None:
+        return None
+
+    # Telegram separates thousands with regular or non-breaking spaces
+    text = extra.decode('utf-8', errors='replace').replace('&nbsp;', ' ')
+    return parse_member_count(text)
@@ -0,0 +1,149 @@
+"""
+In-memory LRU cache for database reads, invalidated by a data-version counter
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import pandas as pd
+
+_MISSING = object()
+
+
+class QueryCache:
+    """
+    Read-through LRU cache keyed by query and parameters
+
+    Every write bumps the data version, which drops all cached results. A
+    result loaded while a write was in progress is not stored, so a cached
+    value always belongs to the current version.
+
+    Writes made elsewhere (another process, another handle on the same file)
+    are caught by source_version: lookups poll it at most once per
+    check_interval, and validate() polls it on demand (the dashboard does so
+    once per rerun). Any change bumps the version as a local write would.
+
+    Results are shared between callers rather than copied. DataFrames come
+    back as shallow copies, so adding or renaming columns is safe, but values
+    must not be modified in place (without pandas copy-on-write that would
+    change the cached result).
+    """
+
+    def __init__(self, maxsize: int = 128, source_version: Optional[Callable[[], Hashable]] = None,
+                 check_interval: float = 5.0):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Results kept before the least recently used is evicted (0 disables caching)
+            source_version: Callable returning a value that changes whenever
+                the underlying data does, whoever wrote it
+            check_interval: Seconds a lookup trusts the last source_version check
+        """
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.source_version = source_version
+        self.check_interval = check_interval
+        self._seen_source_version: Any = _MISSING
+        self._checked_at = float('-inf')
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for a key, loading and storing it on a miss
+
+        Args:
+            key: Query name and frozen parameters
+            load: Zero-argument callable running the query
+        """
+        if self.source_version is not None and time.monotonic() - self._checked_at >= self.check_interval:
+            self.validate()
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+            version = self.version
+
+        value = load()
+
+        with self._lock:
+            if self.maxsize > 0 and version == self.version:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def validate(self) -> int:
+        """
+        Check source_version and drop everything if the data changed behind our back
+
+        Returns:
+            The current data version
+        """
+        if self.source_version is None:
+            return self.version
+        current = self.source_version()
+        with self._lock:
+            self._checked_at = time.monotonic()
+            if current != self._seen_source_version:
+                if self._seen_source_version is not _MISSING:
+                    self.version += 1
+                    self._entries.clear()
+                self._seen_source_version = current
+            return self.version
+
+    def bump(self):
+        """Record that the data changed, invalidating every cached result"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+
+def freeze(value: Any) -> Hashable:
+    """Turn a query parameter into something hashable (lists, sets and generators become tuples)"""
+    if isinstance(value, (str, bytes)) or value is None:
+        return value
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    if isinstance(value, dict):
+        return tuple(sorted(value.items()))
+    if hasattr(value, '__iter__'):
+        return tuple(value)
+    return value
+
+
+def share_result(value: Any) -> Any:
+    """Hand out a cached result: DataFrames as shallow copies (no data copied), anything else as is"""
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    return value
+
+
+def cached_query(method: Callable) -> Callable:
+    """
+    Serve a MemberDatabase read method from self.query_cache
+
+    Iterable arguments are frozen into tuples before the call, so the method
+    sees the same values the cache key was built from.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        args: Tuple = tuple(freeze(a) for a in args)
+        kwargs = {k: freeze(v) for k, v in kwargs.items()}
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        result = self.query_cache.get_or_load(key, lambda: method(self, *args, **kwargs))
+        return share_result(result)
+
+    return wrapper
@@ -0,0 +1,156 @@
+"""
+Registry of tracked groups, loaded from config instead of hard-coded dicts
+"""
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+DEFAULT_REGISTRY_PATH = Path(__file__).resolve().parents[2] / 'data' / 'groups.json'
+
+DEFAULT_COLOR = '#999999'
+
+
+@dataclass(frozen=True)
+class Group:
+    """One tracked community group"""
+    id: str
+    name: str
+    platform: str
+    url: str
+    region: str
+    color: str = DEFAULT_COLOR
+    project: str = 'conflux'
+
+
+class GroupRegistry:
+    """
+    Groups indexed by id, display name, platform, region and project
+
+    All indexes are built once when the registry is created, so every
+    lookup is a dict access.
+    """
+
+    def __init__(self, groups: Iterable[Group], regions: Optional[Iterable[str]] = None):
+        """
+        Build the indexes
+
+        Args:
+            groups: Groups in display order
+            regions: Region display order (regions not listed follow in first-seen order)
+        """
+        self._groups: List[Group] = list(groups)
+        self._by_id: Dict[str, Group] = {}
+        self._by_name: Dict[str, Group] = {}
+        self._by_platform: Dict[str, List[Group]] = {}
+        self._by_project: Dict[str, List[Group]] = {}
+        self._by_region: Dict[str, List[Group]] = OrderedDict((r, []) for r in regions or [])
+
+        for group in self._groups:
+            if group.id in self._by_id:
+                raise ValueError(f"Duplicate group id: {group.id}")
+            if group.name in self._by_name:
+                raise ValueError(f"Duplicate group name: {group.name}")
+
+            self._by_id[group.id] = group
+            self._by_name[group.name] = group
+            self._by_platform.setdefault(group.platform, []).append(group)
+            self._by_project.setdefault(group.project, []).append(group)
+            self._by_region.setdefault(group.region, []).append(group)
+
+        self._region_names = {region: [g.name for g in members] for region, members in self._by_region.items()}
+
+    @classmethod
+    def load(cls, *paths: Union[str, Path]) -> 'GroupRegistry':
+        """
+        Load groups from one or more JSON config files
+
+        Each file has an optional "project" (the default for its groups), an
+        optional "regions" display order and a "groups" list.
+
+        Args:
+            *paths: Config files (defaults to data/groups.json)
+        """
+        groups: List[Group] = []
+        regions: List[str] = []
+
+        for path in paths or (DEFAULT_REGISTRY_PATH,):
+            with open(path, encoding='utf-8') as f:
+                config = json.load(f)
+
+            project = config.get('project', 'conflux')
+            regions.extend(r for r in config.get('regions', []) if r not in regions)
+            for entry in config['groups']:
+                groups.append(Group(**{'project': project, **entry}))
+
+        return cls(groups, regions)
+
+    def __iter__(self) -> Iterator[Group]:
+        return iter(self._groups)
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def by_id(self, group_id: str) -> Group:
+        """Look a group up by its stable id"""
+        return self._by_id[group_id]
+
+    def get(self, name: str) -> Optional[Group]:
+        """Look a group up by display name (None if unknown)"""
+        return self._by_name.get(name)
+
+    def platform(self, platform: str) -> List[Group]:
+        """Groups on a platform ("telegram", "discord", ...)"""
+        return self._by_platform.get(platform, [])
+
+    def project(self, project: str) -> List[Group]:
+        """Groups belonging to a project"""
+        return self._by_project.get(project, [])
+
+    def region(self, region: str) -> List[Group]:
+        """Groups in a region"""
+        return self._by_region.get(region, [])
+
+    @property
+    def names(self) -> List[str]:
+        """All group display names in config order"""
+        return list(self._by_name)
+
+    @property
+    def regions(self) -> Dict[str, List[str]]:
+        """Region name -> group display names, in region display order"""
+        return self._region_names
+
+    def urls(self, platform: str) -> Dict[str, str]:
+        """Display name -> URL for every group on a platform"""
+        return {g.name: g.url for g in self.platform(platform)}
+
+    def color(self, name: str) -> str:
+        """Chart colour for a group (grey if unknown)"""
+        group = self._by_name.get(name)
+        return group.color if group else DEFAULT_COLOR
+
+    def region_of(self, name: str) -> Optional[str]:
+        """Region a group belongs to (None if unknown)"""
+        group = self._by_name.get(name)
+        return group.region if group else None
+
+
+_registries: Dict[Path, GroupRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(path: Union[str, Path] = DEFAULT_REGISTRY_PATH) -> GroupRegistry:
+    """Get the registry for a config file, loading it only the first time"""
+    path = Path(path)
+    with _registries_lock:
+        registry = _registries.get(path)
+        if registry is None:
+            registry = GroupRegistry.load(path)
+            _registries[path] = registry
+        return registry
@@ -0,0 +1,266 @@
+"""
+Retry, backoff and circuit-breaker policy for scrapes
+"""
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import urlparse
+import aiohttp
+
+# HTTP statuses worth retrying; other 4xx responses won't change on a second try
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class ScrapeOutcome:
+    """Result of scraping one group, including how it got there"""
+    name: str
+    count: Optional[int]
+    attempts: int
+    latency: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if a member count was collected"""
+        return self.count is not None
+
+
+class CircuitBreaker:
+    """
+    Per-source breaker: opens after consecutive failures, then lets a single
+    trial request through once reset_timeout has passed
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        """
+        Initialize the breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to wait before allowing a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """True while requests to the source are being refused"""
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Check whether a request may go out now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            # Half-open: let one request probe the source
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        """Close the circuit after a successful request"""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Count a failure, opening the circuit at the threshold"""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+def _status_of(error: Exception) -> Optional[int]:
+    """HTTP status carried by a requests or aiohttp error, if any"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is None:
+        status = getattr(error, 'status', None)
+    return status
+
+
+def _retry_after_of(error: Exception) -> Optional[float]:
+    """Seconds requested by a Retry-After header on the failed response, if any"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or getattr(error, 'headers', None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Decide whether a failed attempt is worth repeating"""
+    status = _status_of(error)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    # Timeouts, connection resets, DNS hiccups (requests errors are OSErrors too);
+    # parse errors and the like are not transient
+    return isinstance(error, (OSError, aiohttp.ClientError))
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff plus one circuit breaker per source
+
+    A source is usually a host, so once t.me starts refusing requests the
+    remaining Telegram groups fail fast instead of each waiting out timeouts.
+    Each call counts at most once against its source's breaker (when it gives
+    up), so one broken group using up its retries can't open the breaker for
+    every other group on the same host.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 failure_threshold: int = 3, reset_timeout: float = 60.0):
+        """
+        Initialize the policy
+
+        Args:
+            max_attempts: Attempts per call, including the first
+            base_delay: Backoff ceiling for the first retry, doubled each time
+            max_delay: Upper bound on any single backoff
+            failure_threshold: Consecutive failed calls (not attempts) that open a source's breaker
+            reset_timeout: Seconds an open breaker waits before a trial request
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def source_for(url: str) -> str:
+        """Breaker key for a URL (its host)"""
+        return urlparse(url).netloc.lower()
+
+    def breaker(self, source: str) -> CircuitBreaker:
+        """Get (or create) the breaker for a source"""
+        with self._lock:
+            breaker = self._breakers.get(source)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._breakers[source] = breaker
+            return breaker
+
+    def backoff(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """
+        Delay before the next attempt (full jitter), honouring Retry-After
+
+        Args:
+            attempt: Number of attempts made so far (1 after the first failure)
+            error: The error that ended the previous attempt
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        retry_after = _retry_after_of(error) if error is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def _after_attempt(self, source: str, error: Exception, attempts: int) -> bool:
+        """Record a failed attempt and return True if another one should follow"""
+        breaker = self.breaker(source)
+        if not is_retryable(error):
+            # The source answered, it just has nothing useful for this group
+            breaker.record_success()
+            return False
+
+        # An open breaker here means this call is the half-open trial, which
+        # gets no retries; otherwise the failure is only recorded on giving up
+        retry = attempts < self.max_attempts and not breaker.is_open
+        if not retry:
+            breaker.record_failure()
+        return retry
+
+    @staticmethod
+    def _circuit_open(name: str, source: str, attempts: int, start: float,
+                      last_error: Optional[str]) -> ScrapeOutcome:
+        """Outcome for a group skipped (or cut short) by an open breaker"""
+        error = f"circuit open for {source}"
+        if last_error:
+            error += f" (last error: {last_error})"
+        return ScrapeOutcome(name, None, attempts, time.monotonic() - start, error)
+
+    def call(self, name: str, source: str, func: Callable[[], Optional[int]]) -> ScrapeOutcome:
+        """
+        Scrape one group under the policy
+
+        Args:
+            name: Group display name (for the outcome)
+            source: Breaker key (see source_for)
+            func: Zero-argument callable doing one attempt and returning a count
+
+        Returns:
+            ScrapeOutcome with the count, attempts used, latency and final error
+        """
+        start = time.monotonic()
+        attempts = 0
+        error = None
+        breaker = self.breaker(source)
+
+        while breaker.allow():
+            attempts += 1
+            try:
+                count = func()
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                if self._after_attempt(source, e, attempts):
+                    time.sleep(self.backoff(attempts, e))
+                    continue
+                return ScrapeOutcome(name, None, attempts, time.monotonic() - start, error)
+
+            breaker.record_success()
+            error = None if count is not None else "member count not found"
+            return ScrapeOutcome(name, count, attempts, time.monotonic() - start, error)
+
+        return self._circuit_open(name, source, attempts, start, error)
+
+    async def call_async(self, name: str, source: str,
+                         func: Callable[[], Awaitable[Optional[int]]]) -> ScrapeOutcome:
+        """
+        Async twin of call: func returns an awaitable for one attempt
+
+        Args:
+            name: Group display name (for the outcome)
+            source: Breaker key (see source_for)
+            func: Zero-argument callable returning an awaitable count
+
+        Returns:
+            ScrapeOutcome with the count, attempts used, latency and final error
+        """
+        start = time.monotonic()
+        attempts = 0
+        error = None
+        breaker = self.breaker(source)
+
+        while breaker.allow():
+            attempts += 1
+            try:
+                count = await func()
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                if self._after_attempt(source, e, attempts):
+                    await asyncio.sleep(self.backoff(attempts, e))
+                    continue
+                return ScrapeOutcome(name, None, attempts, time.monotonic() - start, error)
+
+            breaker.record_success()
+            error = None if count is not None else "member count not found"
+            return ScrapeOutcome(name, count, attempts, time.monotonic() - start, error)
+
+        return self._circuit_open(name, source, attempts, start, error)
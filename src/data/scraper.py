@@ -1,56 +1,185 @@
 """
 Web scraper for Telegram and Discord member counts
 """
+import json
 import re
 import time
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple, TypeVar, Union
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+
+from src.data.browser_pool import BrowserPool, get_browser_pool
+from src.data.http_cache import DEFAULT_TTL, HttpCache, get_http_cache
+from src.data.parsing import extract_telegram_count, parse_member_count
+from src.data.registry import GroupRegistry, get_registry
+from src.data.retry import RetryPolicy, ScrapeOutcome
+from src.utils.rate_limit import HostRateLimiter
+
+_DIGITS = re.compile(r'([\d,]+)')
+
+T = TypeVar('T')
+
+
+def primary_discord(registry: GroupRegistry) -> Tuple[Optional[str], Optional[str]]:
+    """URL and display name of the first configured Discord server, or (None, None) if there is none"""
+    group = next(iter(registry.platform('discord')), None)
+    return (group.url, group.name) if group is not None else (None, None)
 
 
 class MemberScraper:
     """Scrapes member counts from Telegram and Discord"""
 
-    # Group configuration with display names
-    TELEGRAM_GROUPS = {
-        "Africa (TG)": "https://t.me/ConfluxAfrica",
-        "Arabic (TG)": "https://t.me/confluxarabic/",
-        "China Official (TG)": "https://t.me/Conflux_Chinese",
-        "China Web3 Community (TG)": "https://t.me/ConfluxWeb3China",
-        "English (TG)": "https://t.me/Conflux_English",
-        "French (TG)": "https://t.me/ConfluxFrench",
-        "Indonesia (TG)": "https://t.me/Conflux_indonesia",
-        "Korea (TG)": "https://t.me/ConfluxKorea",
-        "LATAM (TG)": "https://t.me/Conflux_LATAM",
-        "Persia (TG)": "https://t.me/ConfluxPersian1",
-        "Russian (TG)": "https://t.me/confluxrussian",
-        "Turkey (TG)": "https://t.me/Conflux_Turkish",
-        "Ukraine (TG)": "https://t.me/Conflux_Ukraine",
-        "Vietnam (TG)": "https://t.me/confluxvietnam",
-    }
-
-    DISCORD_SERVER = "https://discord.com/invite/confluxnetwork"
-    DISCORD_NAME = "English (Discord)"
-
-    def __init__(self, use_selenium: bool = False):
+    # Group configuration with display names (see data/groups.json)
+    TELEGRAM_GROUPS = get_registry().urls('telegram')
+
+    DISCORD_SERVERS = get_registry().urls('discord')
+
+    # Primary Discord server (kept for callers that only know about one; None if none is configured)
+    DISCORD_SERVER, DISCORD_NAME = primary_discord(get_registry())
+
+    def __init__(self, use_selenium: bool = False, max_workers: int = 8,
+                 requests_per_second: float = 4.0, burst: Optional[float] = None,
+                 browser_pool: Optional[BrowserPool] = None, use_cache: bool = True,
+                 cache_ttl: float = DEFAULT_TTL, http_cache: Optional[HttpCache] = None,
+                 retry_policy: Optional[RetryPolicy] = None, registry: Optional[GroupRegistry] = None):
         """
         Initialize the scraper
 
         Args:
             use_selenium: If True, use Selenium for JavaScript-rendered pages
+            max_workers: Number of concurrent fetch workers (1 = sequential)
+            requests_per_second: Politeness limit applied to each host
+            burst: Requests a host may receive back-to-back before throttling
+            browser_pool: Pool to borrow Selenium browsers from (defaults to the shared pool)
+            use_cache: If True, serve and revalidate responses through the on-disk HTTP cache
+            cache_ttl: Seconds a cached response is reused without any network request
+            http_cache: Cache to use (defaults to the shared cache file)
+            retry_policy: Retry/backoff/circuit-breaker policy for every fetch
+            registry: Groups to scrape (defaults to data/groups.json)
         """
+        if registry is not None:
+            self.TELEGRAM_GROUPS = registry.urls('telegram')
+            self.DISCORD_SERVERS = registry.urls('discord')
+            self.DISCORD_SERVER, self.DISCORD_NAME = primary_discord(registry)
+
         self.use_selenium = use_selenium
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.browser_pool = browser_pool
+        self.cache_ttl = cache_ttl
+        self.http_cache = (http_cache or get_http_cache()) if use_cache else None
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = HostRateLimiter(requests_per_second, burst)
+
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        # One pooled connection per worker so keep-alive survives concurrent fetches
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _fetch(self, url: str, parse: Callable[[bytes], Optional[T]]) -> Optional[T]:
+        """
+        GET a URL through the HTTP cache and the per-host rate limiter, and parse it
+
+        Fresh cached bodies are parsed without a request; stale ones are
+        revalidated with a conditional GET. A response is only cached once
+        parse finds a value in it, so an interstitial or blocked page is never
+        served from the cache in place of the real count.
+
+        Args:
+            url: URL to fetch
+            parse: Turns the body into a value (None if the page has none)
+
+        Returns:
+            The parsed value, or None if the page had none
+        """
+        entry = self.http_cache.lookup(url) if self.http_cache else None
+        if entry is not None and self.http_cache.is_fresh(entry, self.cache_ttl):
+            value = parse(entry.body)
+            if value is not None:
+                return value
+            entry = None  # Unusable cached body: fetch it again unconditionally
+
+        self.rate_limiter.acquire(url)
+        try:
+            response = self.session.get(url, timeout=10, headers=HttpCache.conditional_headers(entry))
+        except Exception:
+            self.rate_limiter.failed(url)
+            raise
+        self.rate_limiter.observe(url, response.status_code, response.headers)
+
+        if response.status_code == 304 and entry is not None:
+            value = parse(entry.body)
+            if value is not None:
+                self.http_cache.touch(entry)
+            return value
+
+        response.raise_for_status()
+
+        value = parse(response.content)
+        if value is not None and self.http_cache:
+            self.http_cache.store(url, response.content, response.headers)
+        return value
+
+    @staticmethod
+    def parse_telegram_page(page: Union[str, bytes]) -> Optional[int]:
+        """
+        Extract the member count from a Telegram group page
+
+        Tries the targeted tgme_page_extra extractor first and only builds a
+        full BeautifulSoup tree when that misses.
+
+        Args:
+            page: Page HTML (raw bytes preferred, text accepted)
+
+        Returns:
+            Member count or None if no count was found
+        """
+        count = extract_telegram_count(page)
+        if count is not None:
+            return count
+
+        soup = BeautifulSoup(page, 'html.parser')
+
+        # Telegram shows counts like "14 760 members", "1,234 members" or "1.2K subscribers"
+        count = parse_member_count(soup.get_text())
+        if count is not None:
+            return count
+
+        # If no pattern matches, try finding the count in meta tags or specific divs
+        # This may need adjustment based on actual Telegram page structure
+        member_div = soup.find('div', class_='tgme_page_extra')
+        if member_div:
+            match = _DIGITS.search(member_div.get_text())
+            if match:
+                return int(match.group(1).replace(',', ''))
+
+        return None
+
+    def scrape_telegram_outcome(self, name: str, url: str) -> ScrapeOutcome:
+        """
+        Scrape one Telegram group under the retry policy
+
+        Args:
+            name: Group display name
+            url: Telegram group URL
+
+        Returns:
+            ScrapeOutcome with the count, attempts, latency and final error
+        """
+        outcome = self.retry_policy.call(
+            name, RetryPolicy.source_for(url), lambda: self._fetch(url, self.parse_telegram_page)
+        )
+        if not outcome.ok:
+            print(f"Error scraping Telegram {url}: {outcome.error}")
+        return outcome
 
     def scrape_telegram_group(self, url: str) -> Optional[int]:
         """
@@ -62,159 +191,165 @@ class MemberScraper:
         Returns:
             Member count or None if scraping fails
         """
-        try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Look for member count in various possible locations
-            # Telegram shows counts like "14 760 members", "1,234 members" or "1.2K subscribers"
-            patterns = [
-                r'([\d\s,]+)\s+members',  # Handles "14 760 members" or "1,234 members"
-                r'([\d\s,]+)\s+subscribers',  # Handles "14 760 subscribers" or "1,234 subscribers"
-                r'([\d.]+[KM])\s+members',  # Handles "1.2K members"
-                r'([\d.]+[KM])\s+subscribers',  # Handles "1.2K subscribers"
-            ]
-
-            text = soup.get_text()
-
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    count_str = match.group(1).strip()
-                    # Convert "1.2K" to 1200, "1.5M" to 1500000
-                    if 'K' in count_str.upper():
-                        return int(float(count_str.replace('K', '').replace(',', '').replace(' ', '')) * 1000)
-                    elif 'M' in count_str.upper():
-                        return int(float(count_str.replace('M', '').replace(',', '').replace(' ', '')) * 1000000)
-                    else:
-                        # Remove spaces, commas, and convert to int
-                        return int(count_str.replace(',', '').replace(' ', ''))
-
-            # If no pattern matches, try finding the count in meta tags or specific divs
-            # This may need adjustment based on actual Telegram page structure
-            member_div = soup.find('div', class_='tgme_page_extra')
-            if member_div:
-                match = re.search(r'([\d,]+)', member_div.get_text())
-                if match:
-                    return int(match.group(1).replace(',', ''))
+        return self.scrape_telegram_outcome(url, url).count
 
-            return None
+    def scrape_discord_outcome(self, name: Optional[str] = None) -> ScrapeOutcome:
+        """
+        Scrape one Discord server, with the Selenium fallback if enabled
 
-        except Exception as e:
-            print(f"Error scraping Telegram {url}: {e}")
-            return None
+        Args:
+            name: Display name of the server (defaults to the primary server)
+
+        Returns:
+            ScrapeOutcome with the count, attempts, latency and final error
+        """
+        name = name or self.DISCORD_NAME
+        if name is None:
+            return ScrapeOutcome('Discord', None, 0, 0.0, "no Discord server configured")
+        invite_url = self.DISCORD_SERVERS[name]
+
+        # Try Discord Invite API first (fast, no auth needed)
+        outcome = self._discord_api_outcome(name, invite_url)
+        if outcome.ok or not self.use_selenium:
+            return outcome
 
-    def scrape_discord_server(self) -> Optional[int]:
+        # Fallback to Selenium if API fails
+        start = time.monotonic()
+        count = self._scrape_discord_selenium(invite_url)
+        return ScrapeOutcome(
+            name=name,
+            count=count,
+            attempts=outcome.attempts + 1,
+            latency=outcome.latency + time.monotonic() - start,
+            error=None if count is not None else f"{outcome.error}; Selenium fallback failed",
+        )
+
+    def scrape_discord_server(self, name: Optional[str] = None) -> Optional[int]:
         """
         Scrape member count from Discord invite page
         Uses Discord Invite API (fast, no Selenium needed)
 
+        Args:
+            name: Display name of the server (defaults to the primary server)
+
         Returns:
             Member count or None if scraping fails
         """
-        # Try Discord Invite API first (fast, no auth needed)
-        count = self._scrape_discord_api()
-        if count:
-            return count
-
-        # Fallback to Selenium if API fails
-        if self.use_selenium:
-            return self._scrape_discord_selenium()
+        return self.scrape_discord_outcome(name).count
 
-        return None
+    @staticmethod
+    def discord_invite_api_url(invite_url: str) -> str:
+        """Build the public Invite API URL for a Discord invite link"""
+        # Extract invite code from URL
+        invite_code = invite_url.rstrip('/').split('/')[-1]
+        return f"https://discord.com/api/v10/invites/{invite_code}?with_counts=true"
 
-    def _scrape_discord_api(self) -> Optional[int]:
-        """Scrape Discord using public Invite API (no auth needed)"""
-        try:
-            # Extract invite code from URL
-            invite_code = self.DISCORD_SERVER.split('/')[-1]
+    @staticmethod
+    def parse_discord_invite(data: dict) -> Optional[int]:
+        """Extract the member count from an Invite API response"""
+        member_count = data.get('approximate_member_count', 0)
 
-            # Use Discord's public invite API
-            url = f"https://discord.com/api/v10/invites/{invite_code}?with_counts=true"
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+        if member_count > 0:
+            return member_count
 
-            data = response.json()
-            member_count = data.get('approximate_member_count', 0)
-
-            if member_count > 0:
-                return member_count
+        return None
 
-            return None
+    def _discord_api_outcome(self, name: str, invite_url: str) -> ScrapeOutcome:
+        """Query the public Invite API for one server under the retry policy"""
+        url = self.discord_invite_api_url(invite_url)
+        outcome = self.retry_policy.call(
+            name, RetryPolicy.source_for(url),
+            lambda: self._fetch(url, lambda body: self.parse_discord_invite(json.loads(body)))
+        )
+        if not outcome.ok:
+            print(f"Error scraping Discord with API: {outcome.error}")
+        return outcome
 
-        except Exception as e:
-            print(f"Error scraping Discord with API: {e}")
+    def _scrape_discord_api(self) -> Optional[int]:
+        """Scrape Discord using public Invite API (no auth needed)"""
+        if self.DISCORD_SERVER is None:
             return None
+        return self._discord_api_outcome(self.DISCORD_NAME, self.DISCORD_SERVER).count
 
     def _scrape_discord_requests(self) -> Optional[int]:
         """Scrape Discord using requests (may not work if JS-rendered)"""
-        try:
-            response = self.session.get(self.DISCORD_SERVER, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Discord shows member count on invite pages
-            # Look for patterns like "1,234 members" or "1,234 online"
-            text = soup.get_text()
-
-            patterns = [
-                r'([\d,]+)\s+members',
-                r'([\d,]+)\s+Members',
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, text)
-                if match:
-                    return int(match.group(1).replace(',', ''))
-
+        if self.DISCORD_SERVER is None:
             return None
+        try:
+            # Discord shows member count on invite pages, e.g. "1,234 Members"
+            return self._fetch(
+                self.DISCORD_SERVER,
+                lambda body: parse_member_count(BeautifulSoup(body, 'html.parser').get_text())
+            )
 
         except Exception as e:
             print(f"Error scraping Discord: {e}")
             return None
 
-    def _scrape_discord_selenium(self) -> Optional[int]:
+    def _scrape_discord_selenium(self, invite_url: Optional[str] = None) -> Optional[int]:
         """Scrape Discord using Selenium for JavaScript rendering"""
-        driver = None
+        invite_url = invite_url or self.DISCORD_SERVER
+        if invite_url is None:
+            return None
+        pool = self.browser_pool or get_browser_pool()
         try:
-            # Set up Chrome options
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-
-            # Initialize driver
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-
-            # Load page
-            driver.get(self.DISCORD_SERVER)
-
-            # Wait for member count to load
-            wait = WebDriverWait(driver, 10)
-            # Adjust selector based on actual Discord page structure
-            member_element = wait.until(
-                EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'members')]"))
-            )
+            # Borrow a warm headless browser instead of launching a new one
+            with pool.browser() as driver:
+                # Load page
+                driver.get(invite_url)
 
-            # Extract number
-            text = member_element.text
-            match = re.search(r'([\d,]+)', text)
-            if match:
-                return int(match.group(1).replace(',', ''))
+                # Wait for member count to load
+                wait = WebDriverWait(driver, 10)
+                # Adjust selector based on actual Discord page structure
+                member_element = wait.until(
+                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'members')]"))
+                )
 
-            return None
+                # Extract number
+                return parse_member_count(member_element.text)
 
         except Exception as e:
             print(f"Error scraping Discord with Selenium: {e}")
             return None
-        finally:
-            if driver:
-                driver.quit()
+
+    def _run_all(self, jobs: Iterable[Tuple[str, Callable[[], ScrapeOutcome]]]) -> Dict[str, ScrapeOutcome]:
+        """
+        Run scrape jobs on the bounded worker pool
+
+        Args:
+            jobs: (group name, zero-argument scrape callable) pairs
+
+        Returns:
+            Dictionary mapping group names to outcomes, in job order
+        """
+        def run(name, job):
+            print(f"Scraping {name}...")
+            return job()
+
+        jobs = list(jobs)
+        if self.max_workers == 1 or len(jobs) <= 1:
+            return {name: run(name, job) for name, job in jobs}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+            futures = [(name, pool.submit(run, name, job)) for name, job in jobs]
+            # Collect in configuration order so the result shape matches the sequential path
+            return {name: future.result() for name, future in futures}
+
+    def scrape_all_telegram_outcomes(self) -> Dict[str, ScrapeOutcome]:
+        """
+        Scrape all Telegram groups
+
+        Groups are fetched by a bounded worker pool. Politeness comes from the
+        per-host rate limiter, so total time depends on the rate limit rather
+        than on how many groups are configured.
+
+        Returns:
+            Dictionary mapping group names to scrape outcomes
+        """
+        return self._run_all(
+            (name, lambda name=name, url=url: self.scrape_telegram_outcome(name, url))
+            for name, url in self.TELEGRAM_GROUPS.items()
+        )
 
     def scrape_all_telegram(self) -> Dict[str, Optional[int]]:
         """
@@ -223,13 +358,32 @@ class MemberScraper:
         Returns:
             Dictionary mapping group names to member counts
         """
-        results = {}
-        for name, url in self.TELEGRAM_GROUPS.items():
-            print(f"Scraping {name}...")
-            count = self.scrape_telegram_group(url)
-            results[name] = count
-            time.sleep(1)  # Be respectful, don't hammer servers
+        return {name: outcome.count for name, outcome in self.scrape_all_telegram_outcomes().items()}
+
+    def scrape_all_discord_outcomes(self) -> Dict[str, ScrapeOutcome]:
+        """
+        Scrape every configured Discord server
+
+        Invite API calls share the pooled session and are paced by the
+        X-RateLimit-* / Retry-After headers Discord returns.
+
+        Returns:
+            Dictionary mapping server names to scrape outcomes
+        """
+        return self._run_all(
+            (name, lambda name=name: self.scrape_discord_outcome(name))
+            for name in self.DISCORD_SERVERS
+        )
 
+    def scrape_all_outcomes(self) -> Dict[str, ScrapeOutcome]:
+        """
+        Scrape all groups (Telegram + Discord), keeping per-group attempts, latency and errors
+
+        Returns:
+            Dictionary mapping group names to scrape outcomes
+        """
+        results = self.scrape_all_telegram_outcomes()
+        results.update(self.scrape_all_discord_outcomes())
         return results
 
     def scrape_all(self) -> Dict[str, Optional[int]]:
@@ -239,13 +393,7 @@ class MemberScraper:
         Returns:
             Dictionary mapping group names to member counts
         """
-        results = self.scrape_all_telegram()
-
-        print(f"Scraping {self.DISCORD_NAME}...")
-        discord_count = self.scrape_discord_server()
-        results[self.DISCORD_NAME] = discord_count
-
-        return results
+        return {name: outcome.count for name, outcome in self.scrape_all_outcomes().items()}
 
 
 if __name__ == "__main__":
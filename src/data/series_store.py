@@ -0,0 +1,296 @@
+"""
+Compact in-memory store of member-count time series
+"""
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Marks a group that has no count in a run (int32 has no NaN)
+MISSING = -1
+
+TimeBound = Optional[Union[datetime, np.datetime64, str]]
+
+
+@dataclass(frozen=True)
+class _State:
+    """Everything a SeriesStore holds; replaced whole, never changed once published"""
+    groups: Tuple[str, ...]
+    group_index: Dict[str, int]
+    times: np.ndarray       # buffers with spare capacity past size
+    run_ids: np.ndarray
+    counts: np.ndarray
+    size: int
+
+
+class SeriesStore:
+    """
+    Member counts as a dense groups x runs int32 matrix
+
+    Runs are columns in time order, indexed by a datetime64 array; groups are
+    rows, with names dictionary-encoded to row numbers. Each group's series
+    is one contiguous row, so lookups are a dict access plus a slice and all
+    slices are views into the matrix rather than copies.
+
+    Columns are allocated with spare capacity, so appending new runs is
+    amortised O(groups) per run.
+
+    Writers build the next state under a lock and publish it with one
+    assignment; readers take the current state once, so a read running next to
+    a refresh sees either the old runs or the new ones, never a mix. Appends
+    only fill columns past the published size, which no reader slices.
+    """
+
+    def __init__(self, initial_capacity: int = 64):
+        """
+        Initialize an empty store
+
+        Args:
+            initial_capacity: Runs to allocate room for up front
+        """
+        self._state = self._empty_state(initial_capacity)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @staticmethod
+    def _empty_state(capacity: int) -> _State:
+        """A state with no groups or runs and room for capacity runs"""
+        return _State(
+            groups=(),
+            group_index={},
+            times=np.empty(capacity, dtype='datetime64[ns]'),
+            run_ids=np.empty(capacity, dtype=np.int64),
+            counts=np.full((0, capacity), MISSING, dtype=np.int32),
+            size=0,
+        )
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'SeriesStore':
+        """
+        Build a store from long-format rows
+
+        Args:
+            df: DataFrame with timestamp, group_name and member_count columns,
+                plus run_id if the rows came from get_snapshots
+        """
+        store = cls(initial_capacity=max(64, df['timestamp'].nunique() if not df.empty else 0))
+        store.append(df)
+        return store
+
+    @classmethod
+    def from_database(cls, db) -> 'SeriesStore':
+        """Build a store holding every collection run in a MemberDatabase"""
+        store = cls()
+        store.refresh(db)
+        return store
+
+    def __len__(self) -> int:
+        """Number of runs"""
+        return self._state.size
+
+    @property
+    def groups(self) -> List[str]:
+        """Group names, in row order"""
+        return list(self._state.groups)
+
+    @property
+    def times(self) -> np.ndarray:
+        """Run timestamps (datetime64[ns], ascending)"""
+        state = self._state
+        return state.times[:state.size]
+
+    @property
+    def run_ids(self) -> np.ndarray:
+        """Collection run ids, aligned with times (-1 where unknown)"""
+        state = self._state
+        return state.run_ids[:state.size]
+
+    @property
+    def counts(self) -> np.ndarray:
+        """The groups x runs matrix (MISSING where a group has no count)"""
+        state = self._state
+        return state.counts[:, :state.size]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays, including spare capacity"""
+        state = self._state
+        return state.times.nbytes + state.run_ids.nbytes + state.counts.nbytes
+
+    @staticmethod
+    def _with_groups(state: _State, names: Iterable[str]) -> _State:
+        """The state with rows added for group names not seen before"""
+        new = [name for name in dict.fromkeys(names) if name not in state.group_index]
+        if not new:
+            return state
+        group_index = dict(state.group_index)
+        for name in new:
+            group_index[name] = len(group_index)
+        extra = np.full((len(new), state.counts.shape[1]), MISSING, dtype=np.int32)
+        return replace(state, groups=state.groups + tuple(new), group_index=group_index,
+                   counts=np.vstack([state.counts, extra]))
+
+    @staticmethod
+    def _with_capacity(state: _State, runs: int) -> _State:
+        """The state with column buffers grown (doubling) so `runs` more runs fit"""
+        needed = state.size + runs
+        capacity = state.counts.shape[1]
+        if needed <= capacity:
+            return state
+        while capacity < needed:
+            capacity *= 2
+
+        times = np.empty(capacity, dtype='datetime64[ns]')
+        times[:state.size] = state.times[:state.size]
+        run_ids = np.empty(capacity, dtype=np.int64)
+        run_ids[:state.size] = state.run_ids[:state.size]
+        counts = np.full((state.counts.shape[0], capacity), MISSING, dtype=np.int32)
+        counts[:, :state.size] = state.counts[:, :state.size]
+
+        return replace(state, times=times, run_ids=run_ids, counts=counts)
+
+    def append(self, df: pd.DataFrame):
+        """
+        Add runs newer than the last one held
+
+        Args:
+            df: Long-format rows (timestamp, group_name, member_count, optional
+                run_id) for one or more runs after the current latest run
+
+        Raises:
+            ValueError: If a row is not newer than the latest run in the store
+        """
+        if df.empty:
+            return
+
+        timestamps = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]')
+        with self._lock:
+            state = self._state
+            if state.size and timestamps.min() <= state.times[state.size - 1]:
+                raise ValueError("append() only accepts runs newer than the latest run in the store")
+
+            run_times, run_pos = np.unique(timestamps, return_inverse=True)
+            state = self._with_groups(state, df['group_name'])
+            state = self._with_capacity(state, len(run_times))
+
+            start = state.size
+            end = start + len(run_times)
+            state.times[start:end] = run_times
+            state.run_ids[start:end] = -1
+            if 'run_id' in df:
+                state.run_ids[start + run_pos] = df['run_id'].to_numpy()
+
+            rows = np.fromiter((state.group_index[g] for g in df['group_name']), dtype=np.intp, count=len(df))
+            state.counts[rows, start + run_pos] = df['member_count'].to_numpy(dtype=np.int32)
+            self._state = replace(state, size=end)
+
+    def refresh(self, db) -> int:
+        """
+        Bring the store up to date with a MemberDatabase
+
+        Only runs with a higher id than the newest one held are fetched (one
+        get_runs_after query), so catching up after a collection costs one
+        run's worth of rows. If the database no longer matches what the store
+        holds (data was cleared or older runs were backfilled) the store is
+        rebuilt from scratch.
+
+        Returns:
+            Number of runs added
+        """
+        # One refresher at a time, so concurrent callers don't append the same runs twice
+        with self._refresh_lock:
+            held = self.run_ids
+            last_time = self.times[-1] if len(held) else None
+            last_id = int(held.max()) if len(held) else None
+
+            # Only the runs already held are counted, so a run committed in the
+            # meantime can't make the store look out of sync
+            stale = last_id is not None and len(held) != db.get_run_count(last_id)
+            if not stale:
+                new_rows = db.get_runs_after(last_id)
+                # Backfilled runs get new ids but older times
+                stale = (last_time is not None and not new_rows.empty
+                         and new_rows['timestamp'].min() <= pd.Timestamp(last_time))
+            if stale:
+                self._reset()
+                new_rows = db.get_runs_after(None)
+
+            self.append(new_rows)
+            return new_rows['run_id'].nunique()
+
+    def _reset(self):
+        """Drop everything held (into fresh buffers, so views already handed out stay intact)"""
+        with self._lock:
+            self._state = self._empty_state(self._state.counts.shape[1])
+
+    def group_row(self, name: str) -> Optional[int]:
+        """Row number of a group (None if unknown)"""
+        return self._state.group_index.get(name)
+
+    @staticmethod
+    def _slice(times: np.ndarray, start: TimeBound, end: TimeBound) -> slice:
+        """Column slice of times covering start <= time <= end"""
+        lo = 0 if start is None else int(np.searchsorted(times, np.datetime64(start, 'ns'), side='left'))
+        hi = len(times) if end is None else int(np.searchsorted(times, np.datetime64(end, 'ns'), side='right'))
+        return slice(lo, hi)
+
+    def time_slice(self, start: TimeBound = None, end: TimeBound = None) -> slice:
+        """Column slice covering start <= time <= end (either bound may be None)"""
+        return self._slice(self.times, start, end)
+
+    def series(self, name: str, start: TimeBound = None,
+               end: TimeBound = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        One group's time series within a window
+
+        Args:
+            name: Group display name
+            start: Earliest time to include (None = from the beginning)
+            end: Latest time to include (None = up to the latest run)
+
+        Returns:
+            (times, counts) views; counts is MISSING where the group has no value
+        """
+        state = self._state
+        times = state.times[:state.size]
+        window = self._slice(times, start, end)
+        row = state.group_index.get(name)
+        if row is None:
+            return times[window][:0], np.empty(0, dtype=np.int32)
+        return times[window], state.counts[row, :state.size][window]
+
+    def run(self, index: int) -> np.ndarray:
+        """Counts of every group in one run (by position; -1 is the latest)"""
+        return self.counts[:, index]
+
+    def window(self, start: TimeBound = None, end: TimeBound = None) -> np.ndarray:
+        """The groups x runs sub-matrix for a time window"""
+        return self.labelled_window(start, end)[1]
+
+    def labelled_window(self, start: TimeBound = None,
+                        end: TimeBound = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Group names and the groups x runs sub-matrix for a time window
+
+        Both come from the same state, so the rows always line up with the names.
+
+        Returns:
+            (names as an object array, sub-matrix view)
+        """
+        state = self._state
+        window = self._slice(state.times[:state.size], start, end)
+        return np.asarray(state.groups, dtype=object), state.counts[:, :state.size][:, window]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long-format DataFrame (timestamp, group_name, member_count), missing values dropped"""
+        state = self._state
+        counts = state.counts[:, :state.size]
+        rows, cols = np.nonzero(counts != MISSING)
+        return pd.DataFrame({
+            'timestamp': state.times[:state.size][cols],
+            'group_name': np.asarray(state.groups, dtype=object)[rows],
+            'member_count': counts[rows, cols],
+        }).sort_values(['timestamp', 'group_name'], kind='stable', ignore_index=True)
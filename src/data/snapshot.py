@@ -0,0 +1,197 @@
+"""
+Precomputed dashboard snapshot, written at collection time and memory-mapped by the app
+"""
+import json
+import os
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.data.analytics import GroupDeltas, Overview, RegionDeltas, compare_runs, overview_metrics, summary_text
+
+DEFAULT_SNAPSHOT_PATH = Path(__file__).resolve().parents[2] / 'data' / 'dashboard_snapshot.arrow'
+
+# Bumped whenever the layout changes; files in any other format are ignored
+SNAPSHOT_FORMAT = '2'
+
+# Daily runs whose counts are kept (the default Latest Counts comparison)
+HELD_RUNS = 2
+
+SCHEMA = pa.schema([
+    ('run_id', pa.int32()),
+    ('started_at', pa.timestamp('us')),
+    ('group_name', pa.dictionary(pa.int16(), pa.string())),
+    ('member_count', pa.int32()),
+])
+
+
+def _first_screen(db, counts: pd.DataFrame, daily: pd.DataFrame) -> dict:
+    """The views the dashboard renders before any widget is touched, as JSON-ready values"""
+    views = {'runs': {
+        'id': daily['id'].tolist(),
+        'started_at': [ts.isoformat() for ts in daily['started_at']],
+    }}
+    if daily.empty:
+        return views
+    latest_run = int(daily['id'].iloc[0])
+    previous_run = int(daily['id'].iloc[1]) if len(daily) > 1 else None
+
+    # Latest Counts opens on the latest day against the day before
+    from_run = latest_run if previous_run is None else previous_run
+    group_deltas, region_deltas = compare_runs(counts, from_run, latest_run, db.registry)
+    totals = db.get_aggregated_totals(resolution='auto')
+
+    views.update({
+        'overview': asdict(overview_metrics(counts, latest_run, previous_run)),
+        'comparison': {
+            'runs': [from_run, latest_run],
+            'groups': group_deltas.groups.tolist(),
+            'current': group_deltas.current.tolist(),
+            'previous': group_deltas.previous.tolist(),
+            'regions': region_deltas.regions.tolist(),
+            'region_current': region_deltas.current.tolist(),
+            'region_previous': region_deltas.previous.tolist(),
+            'summary': summary_text(group_deltas),
+        },
+        'totals': {
+            'timestamp': [ts.isoformat() for ts in totals['timestamp']],
+            'total_members': totals['total_members'].tolist(),
+        },
+    })
+    return views
+
+
+def build_snapshot(db) -> pa.Table:
+    """
+    Derive the dashboard's first screen from a MemberDatabase
+
+    The table holds the counts of the latest two daily runs (what the
+    Overview and the default Latest Counts comparison show); the metadata
+    holds the latest run of each day for the date pickers, the overview
+    metrics, the comparison with its region totals and summary text, the
+    All Time totals, and the latest run id so readers can tell whether the
+    snapshot is current. Its size doesn't grow with the number of runs
+    collected, only by one picker entry per day.
+
+    Args:
+        db: MemberDatabase to read
+    """
+    daily = db.get_daily_runs()
+    counts = db.get_snapshots(daily['id'].iloc[:HELD_RUNS].tolist())
+
+    table = pa.Table.from_pandas(
+        counts.rename(columns={'timestamp': 'started_at'})[['run_id', 'started_at', 'group_name', 'member_count']],
+        schema=SCHEMA,
+        preserve_index=False,
+    )
+    latest_run_id = db.get_latest_run_id()
+    latest_run_id = -1 if latest_run_id is None else latest_run_id
+    return table.replace_schema_metadata({
+        'format': SNAPSHOT_FORMAT,
+        'latest_run_id': str(latest_run_id),
+        'generated_at': datetime.now().isoformat(),
+        'views': json.dumps(_first_screen(db, counts, daily)),
+    })
+
+
+def write_snapshot(db, path: Union[str, Path] = DEFAULT_SNAPSHOT_PATH) -> Path:
+    """
+    Write the snapshot as an Arrow IPC file (atomically, via a temp file)
+
+    Args:
+        db: MemberDatabase to read
+        path: Destination file
+
+    Returns:
+        Path written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = build_snapshot(db)
+
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with pa.OSFile(str(tmp), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+    return path
+
+
+class DashboardSnapshot:
+    """Read side of the snapshot file, memory-mapped rather than read into memory"""
+
+    def __init__(self, table: pa.Table):
+        self.table = table
+        metadata = table.schema.metadata or {}
+        self.latest_run_id = int(metadata.get(b'latest_run_id', b'-1'))
+        self.generated_at = metadata.get(b'generated_at', b'').decode()
+        views = json.loads(metadata.get(b'views', b'{}'))
+
+        runs = views.get('runs', {'id': [], 'started_at': []})
+        self.runs = pd.DataFrame({
+            'id': pd.Series(runs['id'], dtype=np.int64),
+            'started_at': pd.to_datetime(pd.Series(runs['started_at'], dtype=object)),
+        })
+        self.held_runs = frozenset(pc.unique(table['run_id']).to_pylist())
+
+        self.overview: Optional[Overview] = Overview(**views['overview']) if 'overview' in views else None
+        self.comparison_runs: Optional[Tuple[int, int]] = None
+        self.comparison: Optional[Tuple[GroupDeltas, RegionDeltas, str]] = None
+        if 'comparison' in views:
+            view = views['comparison']
+            self.comparison_runs = tuple(view['runs'])
+            self.comparison = (
+                GroupDeltas(np.asarray(view['groups'], dtype=object),
+                            np.asarray(view['current'], dtype=np.int64),
+                            np.asarray(view['previous'], dtype=np.int64)),
+                RegionDeltas(np.asarray(view['regions'], dtype=object),
+                             np.asarray(view['region_current'], dtype=np.int64),
+                             np.asarray(view['region_previous'], dtype=np.int64)),
+                view['summary'],
+            )
+        totals = views.get('totals', {'timestamp': [], 'total_members': []})
+        self.totals = pd.DataFrame({
+            'timestamp': pd.to_datetime(pd.Series(totals['timestamp'], dtype=object)),
+            'total_members': pd.Series(totals['total_members'], dtype=np.int64),
+        })
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = DEFAULT_SNAPSHOT_PATH) -> Optional['DashboardSnapshot']:
+        """Open a snapshot file, or return None if there isn't one (or it is in an older format)"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        source = pa.memory_map(str(path), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        if (table.schema.metadata or {}).get(b'format') != SNAPSHOT_FORMAT.encode():
+            return None
+        return cls(table)
+
+    def __len__(self) -> int:
+        """Number of daily runs listed"""
+        return len(self.runs)
+
+    def holds(self, run_ids: Iterable[int]) -> bool:
+        """True if the counts of every given run are in the snapshot"""
+        return self.held_runs.issuperset(run_ids)
+
+    def get_snapshots(self, run_ids: Iterable[int]) -> pd.DataFrame:
+        """
+        Counts of some of the held runs, shaped like MemberDatabase.get_snapshots
+
+        Args:
+            run_ids: Run ids (must be among held_runs)
+
+        Returns:
+            DataFrame with columns: run_id, timestamp, group_name, member_count
+        """
+        mask = pc.is_in(self.table['run_id'], value_set=pa.array(list(run_ids), pa.int32()))
+        df = self.table.filter(mask).to_pandas()
+        df['group_name'] = df['group_name'].astype(str)
+        return df.rename(columns={'started_at': 'timestamp'})[['run_id', 'timestamp', 'group_name', 'member_count']]
@@ -0,0 +1,128 @@
+"""
+Server-side downsampling of chart series
+"""
+from typing import Tuple
+
+import numpy as np
+
+# Screen pixels per plotted point; closer than this and points just overlap
+PIXELS_PER_POINT = 2
+
+# Fewest points worth downsampling to (first, last and something in between)
+MIN_POINTS = 3
+
+
+def point_budget(width_px: int, pixels_per_point: int = PIXELS_PER_POINT) -> int:
+    """Number of points a chart of the given width can usefully show"""
+    return max(MIN_POINTS, width_px // pixels_per_point)
+
+
+def _as_float(x: np.ndarray) -> np.ndarray:
+    """X values as floats (datetimes become nanoseconds) for area arithmetic"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of the points to keep
+
+    The first and last points are always kept. The rest are split into
+    max_points - 2 buckets, and from each the point forming the largest
+    triangle with the previously kept point and the next bucket's average is
+    kept, which preserves the visual shape, including spikes and drops.
+
+    Args:
+        x: X values (numbers or datetime64), ascending
+        y: Y values
+        max_points: Points to keep
+
+    Returns:
+        Sorted indices into x/y
+    """
+    n = len(x)
+    if max_points >= n or max_points < MIN_POINTS:
+        return np.arange(n)
+
+    xf = _as_float(x)
+    yf = np.asarray(y, dtype=float)
+
+    # Bucket edges over the interior points 1 .. n-2
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.intp)
+    keep = np.empty(max_points, dtype=np.intp)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    prev = 0
+    for b in range(max_points - 2):
+        lo, hi = edges[b], edges[b + 1]
+        if b + 2 < len(edges):
+            next_lo, next_hi = edges[b + 1], edges[b + 2]
+        else:
+            next_lo, next_hi = n - 1, n
+        avg_x = xf[next_lo:next_hi].mean()
+        avg_y = yf[next_lo:next_hi].mean()
+
+        # Twice the triangle area; the constant factor doesn't change the argmax
+        area = np.abs((xf[prev] - avg_x) * (yf[lo:hi] - yf[prev])
+                      - (xf[prev] - xf[lo:hi]) * (avg_y - yf[prev]))
+        prev = lo + int(area.argmax())
+        keep[b + 1] = prev
+
+    return keep
+
+
+def min_max(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Min/max buckets: indices of each bucket's lowest and highest point
+
+    Keeps every extreme exactly, at the cost of a more jagged line than LTTB.
+
+    Args:
+        x: X values, ascending
+        y: Y values
+        max_points: Points to keep (two per bucket)
+
+    Returns:
+        Sorted indices into x/y
+    """
+    n = len(x)
+    if max_points >= n or max_points < MIN_POINTS:
+        return np.arange(n)
+
+    yf = np.asarray(y, dtype=float)
+    buckets = max(1, (max_points - 2) // 2)
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.intp)
+
+    keep = [0, n - 1]
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        segment = yf[lo:hi]
+        keep.append(lo + int(segment.argmin()))
+        keep.append(lo + int(segment.argmax()))
+    return np.unique(keep)
+
+
+def downsample(x, y, max_points: int, method: str = 'lttb') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series to at most max_points points before plotting
+
+    Args:
+        x: X values (numbers or datetime64), ascending
+        y: Y values
+        max_points: Point budget (see point_budget)
+        method: 'lttb' or 'minmax'
+
+    Returns:
+        (x, y) arrays, unchanged if they already fit the budget
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if method == 'lttb':
+        keep = lttb(x, y, max_points)
+    elif method == 'minmax':
+        keep = min_max(x, y, max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return x[keep], y[keep]
@@ -0,0 +1,255 @@
+"""
+Token-bucket rate limiting for polite scraping
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Iterable, Mapping, Optional
+from urllib.parse import urlparse
+
+# Hosts known to advertise X-RateLimit-* headers; only these hold a cold burst
+# back until the first response shows the limit
+RATE_LIMITED_HOSTS = frozenset({'discord.com', 'discordapp.com'})
+
+
+class TokenBucket:
+    """Thread-safe token bucket that refills at a fixed rate"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to one second's worth of tokens)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Reserve tokens and return how long the caller must wait before using them
+
+        The balance may go negative, so concurrent callers queue up behind
+        each other instead of all waking at the same moment.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds to wait (0.0 if tokens were available immediately)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until the requested tokens are available"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+
+class ServerRateLimit:
+    """
+    Tracks a server's advertised rate limit (Discord-style response headers)
+
+    X-RateLimit-Limit / -Remaining / -Reset-After describe the current window
+    and Retry-After (on a 429) blocks the host outright. reserve() hands out the
+    remaining slots and tells callers how long to wait once they run out, so
+    requests go at the highest rate the server allows instead of failing.
+
+    With probe=True (hosts in RATE_LIMITED_HOSTS), only one request is let
+    through until the first response arrives, so a cold burst can't overrun a
+    limit nobody has seen yet. If that request fails without a response,
+    failed() lets the next caller probe straight away.
+    """
+
+    # How long to hold other requests while the first one is in flight
+    PROBE_TIMEOUT = 10.0
+    PROBE_POLL = 0.05
+
+    def __init__(self, probe: bool = False):
+        """
+        Initialize the tracker
+
+        Args:
+            probe: Hold other requests while the first one is in flight
+        """
+        self._seen_response = not probe
+        self._probe_started: Optional[float] = None
+        self._limit: Optional[int] = None
+        self._remaining: Optional[int] = None
+        self._window: Optional[float] = None
+        self._reset_at = 0.0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Try to take a request slot
+
+        Returns:
+            0.0 if a slot was taken, otherwise seconds to wait before asking again
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+
+            if not self._seen_response:
+                if self._probe_started is not None and now - self._probe_started < self.PROBE_TIMEOUT:
+                    return self.PROBE_POLL
+                self._probe_started = now
+                return 0.0
+
+            if self._remaining is None:
+                # The host doesn't advertise a limit
+                return 0.0
+
+            if self._remaining <= 0:
+                if now < self._reset_at:
+                    return self._reset_at - now
+                # The window rolled over; assume a full allowance until headers say otherwise
+                self._remaining = self._limit or 1
+                self._reset_at = now + (self._window or 1.0)
+
+            self._remaining -= 1
+            return 0.0
+
+    def failed(self):
+        """Record that a request got no response (timeout, connection error), releasing the probe"""
+        with self._lock:
+            if not self._seen_response:
+                self._probe_started = None
+
+    def update(self, status: int, headers: Mapping[str, str]):
+        """
+        Record the rate-limit headers of a response
+
+        Args:
+            status: HTTP status code
+            headers: Response headers
+        """
+        def number(name):
+            try:
+                return float(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+
+        limit = number('X-RateLimit-Limit')
+        remaining = number('X-RateLimit-Remaining')
+        reset_after = number('X-RateLimit-Reset-After')
+        retry_after = number('Retry-After')
+
+        with self._lock:
+            now = time.monotonic()
+            self._seen_response = True
+            if limit is not None:
+                self._limit = int(limit)
+            if remaining is not None:
+                if self._remaining is not None and now < self._reset_at:
+                    # Same window: slots already handed out to in-flight requests stay taken
+                    self._remaining = min(self._remaining, int(remaining))
+                else:
+                    self._remaining = int(remaining)
+            if reset_after is not None:
+                self._window = reset_after if self._window is None else max(self._window, reset_after)
+                self._reset_at = now + reset_after
+            if status == 429 and retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+
+class HostRateLimiter:
+    """
+    Keeps one token bucket per host so each site gets its own budget, plus
+    whatever rate limit the host itself advertises in its response headers
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 probe_hosts: Iterable[str] = RATE_LIMITED_HOSTS):
+        """
+        Initialize the limiter
+
+        Args:
+            rate: Requests per second allowed for each host
+            capacity: Burst size for each host
+            probe_hosts: Hosts whose first request is sent alone (see ServerRateLimit)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.probe_hosts = frozenset(host.lower() for host in probe_hosts)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._server_limits: Dict[str, ServerRateLimit] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        """Get (or create) the bucket for the host of a URL"""
+        host = self._host(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity)
+                self._buckets[host] = bucket
+            return bucket
+
+    def server_limit_for(self, url: str) -> ServerRateLimit:
+        """Get (or create) the advertised-limit tracker for the host of a URL"""
+        host = self._host(url)
+        with self._lock:
+            limit = self._server_limits.get(host)
+            if limit is None:
+                limit = ServerRateLimit(probe=host in self.probe_hosts)
+                self._server_limits[host] = limit
+            return limit
+
+    def observe(self, url: str, status: int, headers: Mapping[str, str]):
+        """Feed a response's rate-limit headers back into the host's schedule"""
+        self.server_limit_for(url).update(status, headers)
+
+    def failed(self, url: str):
+        """Record that a request to the URL's host got no response"""
+        self.server_limit_for(url).failed()
+
+    def reserve(self, url: str) -> float:
+        """Reserve one request for the URL's host, returning the wait in seconds"""
+        return self.bucket_for(url).reserve()
+
+    def acquire(self, url: str):
+        """Block until a request to the URL's host is allowed"""
+        server_limit = self.server_limit_for(url)
+        while True:
+            wait = server_limit.reserve()
+            if wait <= 0:
+                break
+            time.sleep(wait)
+        self.bucket_for(url).acquire()
+
+    async def acquire_async(self, url: str):
+        """Wait (without blocking the event loop) until a request to the URL's host is allowed"""
+        server_limit = self.server_limit_for(url)
+        while True:
+            wait = server_limit.reserve()
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -44,23 +44,13 @@ try:
     soup = BeautifulSoup(response.text, 'html.parser')
     text = soup.get_text()
 
-    # Look for member count patterns
-    import re
-    patterns = [
-        r'([\d,]+)\s+members',
-        r'([\d,]+)\s+subscribers',
-        r'([\d.]+[KM])\s+members',
-        r'([\d.]+[KM])\s+subscribers',
-    ]
-
-    found = False
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            count_str = match.group(1)
-            print(f"✅ Found member count: {count_str}")
-            found = True
-            break
+    # Look for member count patterns (same matcher the scraper uses)
+    from src.data.parsing import parse_member_count
+    count = parse_member_count(text)
+
+    found = count is not None
+    if found:
+        print(f"✅ Found member count: {count:,}")
 
     if not found:
         print("⚠️  Could not find member count in page")